@@ -0,0 +1,52 @@
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from CSE_Machine.primitives import Primitives
+from CSE_Machine.values import NIL
+
+# Builds tuples element by element the way `T aug x` in an RPAL loop does,
+# through the aug operator. The copying column is what aug costs
+# when every step copies the tuple (O(n^2) overall); it is skipped for the
+# largest size.
+COPY_LIMIT = 20_000
+
+
+def build_with_aug(primitives, size):
+    result = NIL
+    for i in range(size):
+        result = primitives.apply_binary_operator("aug", result, i)
+    return result
+
+
+def build_by_copying(size):
+    result = ()
+    for i in range(size):
+        result = result + (i,)
+    return result
+
+
+def timed(function, *args):
+    start = time.perf_counter()
+    result = function(*args)
+    return result, time.perf_counter() - start
+
+
+def main():
+    primitives = Primitives()
+    print(f"{'elements':>9} {'aug s':>8} {'us/aug':>7} {'copying s':>10}")
+    for size in [1_000, 10_000, 100_000]:
+        result, elapsed = timed(build_with_aug, primitives, size)
+        assert len(result) == size and result[size - 1] == size - 1
+        if size <= COPY_LIMIT:
+            _, copying = timed(build_by_copying, size)
+            copying = f"{copying:>10.4f}"
+        else:
+            copying = f"{'-':>10}"
+        print(f"{size:>9} {elapsed:>8.4f} {elapsed / size * 1e6:>7.3f} {copying}")
+
+
+if __name__ == "__main__":
+    main()
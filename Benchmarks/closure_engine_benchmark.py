@@ -0,0 +1,74 @@
+import contextlib
+import glob
+import io
+import os
+import sys
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from Lexical_Analyzer.lexical_analyzer import stream_tokens, tokenize
+from Parser.parser import RPALParser
+from Standardizer.standardizer import standardize_tree
+from CSE_Machine.control_structures import ControlStructureGenerator
+from CSE_Machine.cseMachine import CSEMachine
+from Closure_Engine.closure_engine import ClosureEngine
+
+# Runs every sample program, and a few recursive ones big enough to time,
+# on the CSE machine and on the closure engine. Times are for running
+# only (best of REPEAT); both engines get their program from the same
+# standardized tree, and their output is checked to be the same.
+REPEAT = 5
+PROGRAMS = {
+    "fib 20": "let rec fib n = n ls 2 -> n | fib (n - 1) + fib (n - 2) in Print (fib 20)",
+    "fact 200": "let rec fact n = n eq 0 -> 1 | n * fact (n - 1) in Print (fact 200)",
+    "sum loop 10k": "let rec loop n acc = n eq 0 -> acc | loop (n - 1) (acc + n) in Print (loop 10000 0)",
+}
+
+
+def standardized_tree(tokens):
+    with open(os.devnull, "w") as devnull, contextlib.redirect_stdout(devnull):
+        ast_root = RPALParser(tokens).build_ast()
+    return standardize_tree(ast_root) if ast_root is not None else None
+
+
+def measure(make_runner, tokens):
+    best = None
+    output = None
+    for _ in range(REPEAT):
+        root = standardized_tree(tokens())
+        if root is None:
+            return None, None
+        runner = make_runner(root)
+        captured = io.StringIO()
+        with contextlib.redirect_stdout(captured):
+            start = time.perf_counter()
+            runner.run()
+            elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+        output = captured.getvalue()
+    return best, output
+
+
+def cse_machine(root):
+    return CSEMachine(ControlStructureGenerator().generate(root))
+
+
+def main():
+    programs = [(os.path.basename(file_name), lambda file_name=file_name: stream_tokens(file_name))
+                for file_name in sorted(glob.glob(os.path.join(ROOT, "Sample_Codes", "*.txt")))]
+    programs += [(name, lambda source=source: tokenize(source)) for name, source in PROGRAMS.items()]
+
+    print(f"{'program':<14} {'cse s':>9} {'closure s':>10} {'speedup':>8}")
+    for name, tokens in programs:
+        cse_time, cse_output = measure(cse_machine, tokens)
+        if cse_time is None:
+            continue
+        closure_time, closure_output = measure(ClosureEngine, tokens)
+        assert closure_output == cse_output, name
+        print(f"{name:<14} {cse_time:>9.5f} {closure_time:>10.5f} {cse_time / closure_time:>7.2f}x")
+
+
+if __name__ == "__main__":
+    main()
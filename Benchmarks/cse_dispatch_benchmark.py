@@ -0,0 +1,121 @@
+import contextlib
+import glob
+import os
+import sys
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from Lexical_Analyzer.lexical_analyzer import stream_tokens, tokenize
+from Parser.parser import RPALParser
+from Standardizer.standardizer import standardize_tree
+from CSE_Machine.control_structures import ControlStructureGenerator
+from CSE_Machine.cseMachine import CSEMachine
+from CSE_Machine.instructions import (
+    NAME, YSTAR, LAMBDA, GAMMA, TAU, BETA, DELTA, UNARY_OPERATOR, BINARY_OPERATOR, LOCAL
+)
+
+# The sample programs run only a few dozen steps; these run enough for
+# stable numbers
+PROGRAMS = {
+    "fib 18": "let rec fib n = n ls 2 -> n | fib (n - 1) + fib (n - 2) in Print (fib 18)",
+    "loop 20k": "let rec loop n acc = n eq 0 -> acc | loop (n - 1) (acc + n) in Print (loop 20000 0)",
+}
+
+
+def compile_program(tokens):
+    ast_root = RPALParser(tokens).build_ast()
+    if ast_root is None:
+        return None
+    return ControlStructureGenerator().generate(standardize_tree(ast_root))
+
+
+def run_chain(control_structures):
+    # The machine's loop with the dispatch this benchmark measures against:
+    # an if/elif chain testing opcodes in the order step() used to, calling
+    # the same handlers the table holds, so only the dispatch differs
+    machine = CSEMachine(control_structures)
+    frames = machine.frames
+    steps = 0
+    while frames:
+        frame = frames[-1]
+        code, pc = frame[0], frame[1]
+        if pc == len(code):
+            machine.finish_frame()
+            continue
+        frame[1] = pc + 1
+        CE = code[pc]
+        opcode = CE.opcode
+        if opcode == UNARY_OPERATOR:
+            machine._execute_unary_operator(CE)
+        elif opcode == BINARY_OPERATOR:
+            machine._execute_binary_operator(CE)
+        elif opcode == LAMBDA:
+            machine._execute_lambda(CE)
+        elif opcode == BETA:
+            machine._execute_beta(CE)
+        elif opcode == TAU:
+            machine._execute_tau(CE)
+        elif opcode == GAMMA:
+            machine._execute_gamma(CE)
+        elif opcode == DELTA:
+            machine._execute_delta(CE)
+        elif opcode == NAME:
+            machine._execute_name(CE)
+        elif opcode == LOCAL:
+            machine._execute_local(CE)
+        elif opcode == YSTAR:
+            machine._execute_ystar(CE)
+        else:
+            machine._execute_literal(CE)
+        steps += 1
+    return steps
+
+
+def run_stepwise(control_structures):
+    # One step() call per instruction: table dispatch plus a method call
+    machine = CSEMachine(control_structures)
+    steps = 0
+    while machine.step():
+        steps += 1
+    return steps
+
+
+def run_dispatch(control_structures):
+    machine = CSEMachine(control_structures)
+    machine.run()
+    return machine.step_count
+
+
+def measure(runner, control_structures, repeat=5):
+    best = None
+    with open(os.devnull, "w") as devnull, contextlib.redirect_stdout(devnull):
+        for _ in range(repeat):
+            start = time.perf_counter()
+            steps = runner(control_structures)
+            elapsed = time.perf_counter() - start
+            best = elapsed if best is None else min(best, elapsed)
+    return steps, best
+
+
+def main():
+    print(f"{'program':<12} {'steps':>7} {'if/elif steps/s':>16} {'table steps/s':>14} "
+          f"{'speedup':>8} {'step() steps/s':>15}")
+    programs = [(os.path.basename(file_name), lambda file_name=file_name: stream_tokens(file_name))
+                for file_name in sorted(glob.glob(os.path.join(ROOT, "Sample_Codes", "*.txt")))]
+    programs += [(name, lambda source=source: tokenize(source)) for name, source in PROGRAMS.items()]
+    for name, tokens in programs:
+        with open(os.devnull, "w") as devnull, contextlib.redirect_stdout(devnull):
+            control_structures = compile_program(tokens())
+        if control_structures is None:
+            continue
+        steps, chain = measure(run_chain, control_structures)
+        table_steps, table = measure(run_dispatch, control_structures)
+        _, stepwise = measure(run_stepwise, control_structures)
+        assert table_steps == steps
+        print(f"{name:<12} {steps:>7} {steps / chain:>16.0f} {steps / table:>14.0f} "
+              f"{chain / table:>7.2f}x {steps / stepwise:>15.0f}")
+
+if __name__ == "__main__":
+    main()
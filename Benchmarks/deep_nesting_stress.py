@@ -0,0 +1,55 @@
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from Lexical_Analyzer.lexical_analyzer import tokenize
+from Parser.parser import RPALParser
+from Standardizer.standardizer import standardize_tree
+from CSE_Machine.control_structures import ControlStructureGenerator
+from CSE_Machine.cseMachine import CSEMachine
+from CSE_Machine.values import render
+
+DEPTH = 100_000
+
+# Programs whose trees are DEPTH levels deep, with what the front end must
+# make of them at depth n: the number of control structures, the length of
+# delta0 and the rendered result of running it (None where running it
+# costs too much: the result of application grows quadratically, the one
+# of power is a tower of exponents)
+PROGRAMS = {
+    "parentheses": (lambda n: "(" * n + "x" + ")" * n, lambda n: 1, lambda n: 1, "x"),
+    "nested let": (lambda n: "let x = 1 in " * n + "x", lambda n: n + 1, lambda n: 3, "1"),
+    "nested fn": (lambda n: "fn x. " * n + "x", lambda n: n + 1, lambda n: 1, "[lambda closure: x: 1]"),
+    "conditionals": (lambda n: "a -> b | " * n + "c", lambda n: 2 * n + 1, lambda n: 4, "c"),
+    "application": (lambda n: "f" + " x" * n, lambda n: 1, lambda n: 2 * n + 1, None),
+    "power": (lambda n: "2 ** " * n + "2", lambda n: 1, lambda n: 2 * n + 1, None),
+    "where": (lambda n: "x" + " where x = (y" * n + ")" * n, lambda n: n + 1, lambda n: 2 * n + 1, "y"),
+}
+
+
+def run_front_end(source):
+    ast_root = RPALParser(tokenize(source)).build_ast()
+    standardized_root = standardize_tree(ast_root)
+    return ControlStructureGenerator().generate(standardized_root)
+
+
+def main():
+    depth = int(sys.argv[1]) if len(sys.argv) > 1 else DEPTH
+    print(f"depth {depth}, recursion limit {sys.getrecursionlimit()}")
+    for name, (make_source, delta_count, delta0_length, expected) in PROGRAMS.items():
+        source = make_source(depth)
+        start = time.perf_counter()
+        deltas = run_front_end(source)
+        elapsed = time.perf_counter() - start
+        assert len(deltas) == delta_count(depth), f"{name}: {len(deltas)} control structures"
+        assert len(deltas["delta0"]) == delta0_length(depth), f"{name}: delta0 has {len(deltas['delta0'])} items"
+        if expected is not None:
+            result = render(CSEMachine(deltas).run())
+            assert result == expected, f"{name}: result {result}"
+        print(f"  {name:<14} ok  {elapsed:7.2f} s  {len(deltas):>7} control structures")
+
+
+if __name__ == "__main__":
+    main()
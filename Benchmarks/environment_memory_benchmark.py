@@ -0,0 +1,48 @@
+import contextlib
+import gc
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from Lexical_Analyzer.lexical_analyzer import tokenize
+from Parser.parser import RPALParser
+from Standardizer.standardizer import standardize_tree
+from CSE_Machine.control_structures import ControlStructureGenerator
+from CSE_Machine.cseMachine import CSEMachine
+
+# A loop written as tail recursion: every iteration is one application
+LOOP = "let rec loop n acc = n eq 0 -> acc | loop (n - 1) (acc + n) in Print (loop {0} 0)"
+
+
+def compile_source(source):
+    ast_root = RPALParser(tokenize(source)).build_ast()
+    return ControlStructureGenerator().generate(standardize_tree(ast_root))
+
+
+def benchmark(iterations):
+    machine = CSEMachine(compile_source(LOOP.format(iterations)))
+    with open(os.devnull, "w") as devnull, contextlib.redirect_stdout(devnull):
+        start = time.perf_counter()
+        machine.run()
+        elapsed = time.perf_counter() - start
+    return machine, elapsed
+
+
+def main():
+    CSEMachine.count_environments = True
+    print(f"{'iterations':>10} {'steps':>8} {'peak envs':>10} {'live after':>11} {'seconds':>8}")
+    for iterations in [100, 1_000, 10_000, 100_000]:
+        machine, elapsed = benchmark(iterations)
+        steps, peak = machine.step_count, machine.peak_environments
+        # Once the machine is gone every one of its frames should be too
+        # (the machine itself sits in a cycle through its dispatch table)
+        counter = machine.environment_counter
+        del machine
+        gc.collect()
+        print(f"{iterations:>10} {steps:>8} {peak:>10} {counter.live:>11} {elapsed:>8.4f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,39 @@
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from Lexical_Analyzer.lexical_analyzer import tokenize
+
+# A small, representative chunk of RPAL that is repeated to build large inputs
+SNIPPET = """// sum of the first n numbers
+let rec sum n = n eq 0 -> 0 | n + sum (n - 1)
+and greeting = 'Hello, world'
+in Print (sum 10, greeting, (1, 2, 3) aug 4, not true or false)
+"""
+
+
+def generate_source(size_in_bytes):
+    repeats = max(1, size_in_bytes // len(SNIPPET))
+    return SNIPPET * repeats
+
+
+def benchmark(size_in_bytes):
+    source = generate_source(size_in_bytes)
+    start = time.perf_counter()
+    tokens = tokenize(source)
+    elapsed = time.perf_counter() - start
+    return len(source), len(tokens), elapsed
+
+
+def main():
+    print(f"{'bytes':>10} {'tokens':>10} {'seconds':>10} {'MB/s':>8} {'us/token':>9}")
+    for size in [10_000, 100_000, 500_000, 1_000_000, 5_000_000]:
+        length, count, elapsed = benchmark(size)
+        print(f"{length:>10} {count:>10} {elapsed:>10.4f} "
+              f"{length / elapsed / 1e6:>8.2f} {elapsed / count * 1e6:>9.3f}")
+
+
+if __name__ == "__main__":
+    main()
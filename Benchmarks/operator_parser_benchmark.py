@@ -0,0 +1,44 @@
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from Lexical_Analyzer.lexical_analyzer import tokenize
+from Parser.parser import RPALParser
+
+# Operator-heavy tuple elements touching every B/A/At/Af/Ap/R level
+ELEMENTS = [
+    "x{0}",
+    "f x {0}",
+    "a + b * {0} - c / d",
+    "not a < {0} & b >= c or d eq e",
+    "-x ** 2 ** {0}",
+    "t @ g (u, {0})",
+]
+
+
+def generate_source(elements):
+    body = ", ".join(ELEMENTS[i % len(ELEMENTS)].format(i) for i in range(elements))
+    return f"Print ({body})"
+
+
+def time_parse(tokens, precedence_climbing):
+    parser = RPALParser(tokens)
+    parser.use_precedence_climbing = precedence_climbing
+    start = time.perf_counter()
+    parser.build_ast()
+    return time.perf_counter() - start
+
+
+def main():
+    print(f"{'tokens':>8} {'descent (s)':>12} {'climbing (s)':>13} {'speedup':>8}")
+    for elements in [1_000, 10_000, 50_000]:
+        tokens = tokenize(generate_source(elements))
+        descent = min(time_parse(tokens, False) for _ in range(3))
+        climbing = min(time_parse(tokens, True) for _ in range(3))
+        print(f"{len(tokens):>8} {descent:>12.4f} {climbing:>13.4f} {descent / climbing:>7.2f}x")
+
+
+if __name__ == "__main__":
+    main()
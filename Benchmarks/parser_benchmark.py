@@ -0,0 +1,37 @@
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from Lexical_Analyzer.lexical_analyzer import tokenize
+from Parser.parser import RPALParser
+
+# Each tuple element contributes 8 tokens: x + 1 * f y , (plus the comma)
+ELEMENT = "x{0} + {0} * f y"
+
+
+def generate_source(token_count):
+    elements = max(2, token_count // 8)
+    body = ", ".join(ELEMENT.format(i) for i in range(elements))
+    return f"let f y = y in Print ({body})"
+
+
+def benchmark(token_count):
+    tokens = tokenize(generate_source(token_count))
+    parser = RPALParser(tokens)
+    start = time.perf_counter()
+    parser.build_ast()
+    elapsed = time.perf_counter() - start
+    return len(tokens), elapsed
+
+
+def main():
+    print(f"{'tokens':>10} {'seconds':>10} {'us/token':>9}")
+    for count in [10_000, 100_000, 1_000_000]:
+        tokens, elapsed = benchmark(count)
+        print(f"{tokens:>10} {elapsed:>10.4f} {elapsed / tokens * 1e6:>9.3f}")
+
+
+if __name__ == "__main__":
+    main()
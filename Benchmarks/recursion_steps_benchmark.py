@@ -0,0 +1,49 @@
+import contextlib
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from Lexical_Analyzer.lexical_analyzer import tokenize
+from Parser.parser import RPALParser
+from Standardizer.standardizer import standardize_tree
+from CSE_Machine.control_structures import ControlStructureGenerator
+from CSE_Machine.cseMachine import CSEMachine
+
+# Recursive programs, run with Y producing eta closures (every call goes
+# through Rule 7) and with directly recursive closures
+PROGRAMS = {
+    "fib 20": "let rec fib n = n ls 2 -> n | fib (n - 1) + fib (n - 2) in Print (fib 20)",
+    "fact 200": "let rec fact n = n eq 0 -> 1 | n * fact (n - 1) in Print (fact 200)",
+    "sum loop 10k": "let rec loop n acc = n eq 0 -> acc | loop (n - 1) (acc + n) in Print (loop 10000 0)",
+}
+
+
+def compile_source(source):
+    ast_root = RPALParser(tokenize(source)).build_ast()
+    return ControlStructureGenerator().generate(standardize_tree(ast_root))
+
+
+def measure(control_structures, direct_recursion):
+    CSEMachine.direct_recursion = direct_recursion
+    machine = CSEMachine(control_structures)
+    with open(os.devnull, "w") as devnull, contextlib.redirect_stdout(devnull):
+        start = time.perf_counter()
+        machine.run()
+        elapsed = time.perf_counter() - start
+    return machine.step_count, elapsed
+
+
+def main():
+    print(f"{'program':<14} {'eta steps':>10} {'direct steps':>13} {'steps saved':>12} {'speedup':>8}")
+    for name, source in PROGRAMS.items():
+        control_structures = compile_source(source)
+        eta_steps, eta_time = measure(control_structures, False)
+        direct_steps, direct_time = measure(control_structures, True)
+        saved = 1 - direct_steps / eta_steps
+        print(f"{name:<14} {eta_steps:>10} {direct_steps:>13} {saved:>11.0%} {eta_time / direct_time:>7.2f}x")
+
+
+if __name__ == "__main__":
+    main()
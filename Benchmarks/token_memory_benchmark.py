@@ -0,0 +1,33 @@
+import os
+import sys
+import tracemalloc
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from Lexical_Analyzer.lexical_analyzer import tokenize, compact_tokenize
+from lexer_benchmark import generate_source
+
+
+def measure(function, source):
+    """Return (result, bytes still allocated by function once it returns)"""
+    tracemalloc.start()
+    result = function(source)
+    current, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return result, current
+
+
+def main():
+    print(f"{'bytes':>10} {'tokens':>9} {'MyToken list':>14} {'CompactTokens':>14} {'reduction':>10}")
+    for size in [100_000, 1_000_000, 5_000_000]:
+        source = generate_source(size)
+        token_list, list_bytes = measure(tokenize, source)
+        count = len(token_list)
+        del token_list
+        _, compact_bytes = measure(compact_tokenize, source)
+        print(f"{len(source):>10} {count:>9} {list_bytes:>14} {compact_bytes:>14} "
+              f"{list_bytes / compact_bytes:>9.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,65 @@
+import os
+import sys
+import time
+import tracemalloc
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from Lexical_Analyzer.lexical_analyzer import generate_tokens
+from Parser.parser import RPALParser
+from Standardizer.standardizer import standardize_tree
+from CSE_Machine.control_structures import ControlStructureGenerator
+
+DEFINITION = "let f{0} (a, b) x = a + b * x - f{1} x where g = (x, a) in\n"
+
+
+def generate_source(definitions):
+    body = "".join(DEFINITION.format(i, max(i - 1, 0)) for i in range(definitions))
+    return body + "Print (f0 (1, 2) 3)"
+
+
+def count_nodes(root):
+    count = 0
+    stack = [root]
+    while stack:
+        node = stack.pop()
+        count += 1
+        stack.extend(node.children)
+    return count
+
+
+def measure(source):
+    """Memory retained by the AST and by the standardized tree"""
+    tracemalloc.start()
+    ast_root = RPALParser(generate_tokens(source)).build_ast()
+    ast_bytes = tracemalloc.get_traced_memory()[0]
+    nodes = count_nodes(ast_root)
+    standardize_tree(ast_root)
+    tree_bytes = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    return nodes, ast_bytes, tree_bytes
+
+
+def time_stages(source):
+    start = time.perf_counter()
+    ast_root = RPALParser(generate_tokens(source)).build_ast()
+    parsed = time.perf_counter()
+    standardized_root = standardize_tree(ast_root)
+    standardized = time.perf_counter()
+    ControlStructureGenerator().generate(standardized_root)
+    generated = time.perf_counter()
+    return parsed - start, standardized - parsed, generated - standardized
+
+
+def main():
+    print(f"{'nodes':>9} {'AST MB':>8} {'B/node':>7} {'ST MB':>7} "
+          f"{'parse s':>8} {'standardize s':>14} {'generate s':>11}")
+    for definitions in [1_000, 10_000, 30_000]:
+        source = generate_source(definitions)
+        nodes, ast_bytes, tree_bytes = measure(source)
+        parse_time, standardize_time, generate_time = time_stages(source)
+        print(f"{nodes:>9} {ast_bytes / 1e6:>8.2f} {ast_bytes / nodes:>7.0f} {tree_bytes / 1e6:>7.2f} "
+              f"{parse_time:>8.3f} {standardize_time:>14.3f} {generate_time:>11.3f}")
+
+if __name__ == "__main__":
+    main()
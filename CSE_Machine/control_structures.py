@@ -1,3 +1,8 @@
+from CSE_Machine.instructions import (
+    Instruction, LAMBDA, TAU, DELTA, BETA_INSTRUCTION, leaf_instruction
+)
+from CSE_Machine.lexical_addressing import resolve_addresses
+
 class ControlStructureGenerator:
     def __init__(self):
         self.deltas = {}
@@ -7,73 +12,87 @@ class ControlStructureGenerator:
         # the very first control‐structure is called delta0
         control_struct = self._traverse(node)
         self.deltas["delta0"] = control_struct
-        return self.deltas
+        return resolve_addresses(self.deltas)
     
     def _traverse(self, node):
+        # Pre-order flattening driven by an explicit work stack, so nesting
+        # depth is not limited by the recursion limit. Each entry either
+        # visits a node, appending to the given result list, or stores a
+        # finished list as a delta once its whole body has been visited.
         result = []
+        work = [("visit", node, result)]
         
-        # ─── handle lambda ───
-        if node.value == "lambda":
-            delta_name = f"delta{self.delta_counter + 1}"
-            self.delta_counter += 1
+        while work:
+            action, item, target = work.pop()
             
-            # Check if first child is a comma node
-            if len(node.children) >= 2 and node.children[0].value == ",":
-                comma_node = node.children[0]
-                body = node.children[1]
-                
-                # Get the children of the comma node
+            if action == "store":
+                self.deltas[item] = target
+                continue
+            
+            node = item
+            
+            # ─── handle lambda ───
+            if node.value == "lambda":
+                delta_name = f"delta{self.delta_counter + 1}"
+                self.delta_counter += 1
                 
-                if len(comma_node.children) >= 2:
-                    # Extract values from all children
-                    values = [child.value for child in comma_node.children]
+                # Check if first child is a comma node
+                if len(node.children) >= 2 and node.children[0].value == ",":
+                    comma_node = node.children[0]
+                    body = node.children[1]
                     
-                    # Create comma-separated string from all values
-                    values_str = ','.join(map(str, values))
+                    # Get the children of the comma node
                     
-                    # Generate lambda name with all values
-                    lam_name = f"lambda{self.delta_counter}{values_str}"
+                    if len(comma_node.children) >= 2:
+                        # Bind all the values of the comma node
+                        params = tuple(child.value for child in comma_node.children)
+                    else:
+                        # Fallback if comma doesn't have enough children
+                        params = ()
                 else:
-                    # Fallback if comma doesn't have enough children
-                    lam_name = f"lambda{self.delta_counter}"
-            else:
-                # Original lambda handling
-                var = node.children[0].value
-                body = node.children[1]
-                lam_name = f"lambda{self.delta_counter}{var}"
+                    # Original lambda handling
+                    params = (node.children[0].value,)
+                    body = node.children[1]
+                
+                target.append(Instruction(LAMBDA, (self.delta_counter, params)))
+                # build the body‐structure as its own delta
+                body_struct = []
+                work.append(("store", delta_name, body_struct))
+                work.append(("visit", body, body_struct))
             
-            # build the body‐structure as its own delta
-            body_struct = self._traverse(body)
-            self.deltas[delta_name] = body_struct
-            result.append(lam_name)
-        
-        # ─── NEW: handle tau nodes ───
-        elif node.value == "tau":
-            N = len(node.children)
-            result.append(f"tau{N}")
-            # Process all children
-            for child in node.children:
-                result.extend(self._traverse(child))
-        
-        # ─── handle conditional (->) ───
-        elif node.value == "->":
-            # children: [cond, true_branch, false_branch]
-            cond_node, true_node, false_node = node.children
-            # allocate two new deltas
-            delta_true  = f"delta{self.delta_counter + 1}"
-            delta_false = f"delta{self.delta_counter + 2}"
-            self.delta_counter += 2
-            # emit them, then 'beta', then the flattened condition
-            result.extend([delta_true, delta_false, "beta"])
-            result.extend(self._traverse(cond_node))
-            # build each branch into its own delta
-            self.deltas[delta_true]  = self._traverse(true_node)
-            self.deltas[delta_false] = self._traverse(false_node)
-        
-        # ─── everything else ───
-        else:
-            result.append(node.value)
-            for child in node.children:
-                result.extend(self._traverse(child))
+            # ─── NEW: handle tau nodes ───
+            elif node.value == "tau":
+                N = len(node.children)
+                target.append(Instruction(TAU, N))
+                # Process all children
+                for child in reversed(node.children):
+                    work.append(("visit", child, target))
+            
+            # ─── handle conditional (->) ───
+            elif node.value == "->":
+                # children: [cond, true_branch, false_branch]
+                cond_node, true_node, false_node = node.children
+                # allocate two new deltas
+                delta_true  = f"delta{self.delta_counter + 1}"
+                delta_false = f"delta{self.delta_counter + 2}"
+                self.delta_counter += 2
+                # emit them, then 'beta', then the flattened condition
+                target.extend([Instruction(DELTA, delta_true), Instruction(DELTA, delta_false),
+                               BETA_INSTRUCTION])
+                # build each branch into its own delta (pushed in reverse:
+                # condition first, then the true branch, then the false one)
+                true_struct = []
+                false_struct = []
+                work.append(("store", delta_false, false_struct))
+                work.append(("visit", false_node, false_struct))
+                work.append(("store", delta_true, true_struct))
+                work.append(("visit", true_node, true_struct))
+                work.append(("visit", cond_node, target))
+            
+            # ─── everything else ───
+            else:
+                target.append(leaf_instruction(node.value))
+                for child in reversed(node.children):
+                    work.append(("visit", child, target))
         
         return result
@@ -0,0 +1,45 @@
+class EnvironmentCounter:
+    """Environment frames of one machine: how many are alive now, and the
+    most that were alive at once"""
+    __slots__ = ("live", "peak")
+
+    def __init__(self):
+        self.live = 0
+        self.peak = 0
+
+
+class Environment:
+    """One environment frame: the values bound when it was created, in the
+    slots lexical addressing gave the parameters of its lambda, linked to
+    the environment it extends.
+
+    Frames are referenced only by the closures and the control frames that
+    use them, so a frame is freed as soon as nothing can reach it - by
+    reference counting, except for frames in a reference cycle (a recursive
+    closure bound in its own frame), which wait for the garbage collector."""
+    __slots__ = ("name", "values", "parent")
+
+    def __init__(self, name, values, parent):
+        self.name = name
+        self.values = values
+        self.parent = parent
+
+    def __repr__(self):
+        return self.name
+
+
+class CountedEnvironment(Environment):
+    """Environment frame that reports its creation and its release to the
+    counter of the machine that made it. A finalizer on every frame is
+    not free, so machines only use these when asked to count."""
+    __slots__ = ("counter",)
+
+    def __init__(self, name, values, parent, counter):
+        super().__init__(name, values, parent)
+        self.counter = counter
+        counter.live += 1
+        if counter.live > counter.peak:
+            counter.peak = counter.live
+
+    def __del__(self):
+        self.counter.live -= 1
@@ -0,0 +1,119 @@
+# Instruction set of the CSE machine.
+#
+# ControlStructureGenerator emits Instruction objects instead of strings
+# such as "lambda3x" or "tau2", with every operand already split out, so the
+# machine never has to re-parse an instruction while executing it.
+# disassemble() turns an instruction back into its textual form for -cs.
+#
+# Literal operands are the runtime values themselves (int, bool, str
+# without quotes, NIL, DUMMY), converted once here rather than on every
+# operation the machine performs on them.
+
+from CSE_Machine.values import NIL, DUMMY
+
+# Opcodes
+NAME = 0              # operand: identifier no lambda binds (builtins)
+LITERAL = 1           # operand: the literal's value
+YSTAR = 2             # the Y fixed-point combinator
+LAMBDA = 3            # operand: (k, params) - body is delta k
+GAMMA = 4
+TAU = 5               # operand: number of tuple elements
+BETA = 6
+DELTA = 7             # operand: delta name (branch of a conditional)
+UNARY_OPERATOR = 8    # operand: operator
+BINARY_OPERATOR = 9   # operand: operator
+LOCAL = 10            # operand: (depth, slot, name) - see lexical_addressing
+
+UNARY_OPERATORS = {"not", "neg"}
+BINARY_OPERATORS = {"or", "&", "gr", "ge", "ls", "le", "eq", "ne",
+                    "+", "-", "*", "/", "**", "aug"}
+LITERAL_KEYWORDS = {"true": True, "false": False, "nil": NIL, "dummy": DUMMY}
+
+# Escape sequences allowed in RPAL strings
+STRING_ESCAPES = {"n": "\n", "t": "\t", "\\": "\\", "'": "'"}
+STRING_UNESCAPES = {value: "\\" + key for key, value in STRING_ESCAPES.items()}
+
+
+class Instruction:
+    __slots__ = ("opcode", "operand")
+
+    def __init__(self, opcode, operand=None):
+        self.opcode = opcode
+        self.operand = operand
+
+    def __repr__(self):
+        return disassemble(self)
+
+    __str__ = __repr__
+
+
+# Operand-less instructions are shared
+GAMMA_INSTRUCTION = Instruction(GAMMA)
+BETA_INSTRUCTION = Instruction(BETA)
+YSTAR_INSTRUCTION = Instruction(YSTAR)
+
+
+def leaf_instruction(value):
+    """Instruction for a standardized tree node that is not lambda/tau/->"""
+    if value == "gamma":
+        return GAMMA_INSTRUCTION
+    if value == "Y":
+        return YSTAR_INSTRUCTION
+    if value in UNARY_OPERATORS:
+        return Instruction(UNARY_OPERATOR, value)
+    if value in BINARY_OPERATORS:
+        return Instruction(BINARY_OPERATOR, value)
+    if value in LITERAL_KEYWORDS:
+        return Instruction(LITERAL, LITERAL_KEYWORDS[value])
+    if value.isdigit():
+        return Instruction(LITERAL, int(value))
+    if value.startswith("'"):
+        return Instruction(LITERAL, decode_string(value[1:-1]))
+    return Instruction(NAME, value)
+
+
+def decode_string(text):
+    """Value of the text between the quotes of a string literal"""
+    if "\\" not in text:
+        return text
+    chars = []
+    i = 0
+    while i < len(text):
+        char = text[i]
+        if char == "\\" and i + 1 < len(text) and text[i + 1] in STRING_ESCAPES:
+            char = STRING_ESCAPES[text[i + 1]]
+            i += 1
+        chars.append(char)
+        i += 1
+    return "".join(chars)
+
+
+def literal_text(value):
+    """Source text of a literal value"""
+    if value is True:
+        return "true"
+    if value is False:
+        return "false"
+    if isinstance(value, str):
+        return "'" + "".join(STRING_UNESCAPES.get(char, char) for char in value) + "'"
+    return str(value)
+
+
+def disassemble(instruction):
+    opcode = instruction.opcode
+    if opcode == LAMBDA:
+        k, params = instruction.operand
+        return f"lambda{k}{','.join(params)}"
+    if opcode == TAU:
+        return f"tau{instruction.operand}"
+    if opcode == GAMMA:
+        return "gamma"
+    if opcode == BETA:
+        return "beta"
+    if opcode == YSTAR:
+        return "Y"
+    if opcode == LITERAL:
+        return literal_text(instruction.operand)
+    if opcode == LOCAL:
+        return instruction.operand[2]
+    return str(instruction.operand)
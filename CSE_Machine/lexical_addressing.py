@@ -0,0 +1,58 @@
+from CSE_Machine.instructions import Instruction, NAME, LAMBDA, DELTA, LOCAL
+
+# Lexical addressing of variables.
+#
+# Every environment the machine creates belongs to one lambda: applying
+# lambda k makes a frame holding its parameters, whose parent is the
+# environment the lambda instruction was executed in. Conditional branches
+# run in the environment of the delta that chose them. So the frame chain
+# at any instruction is known statically, and a variable can be found as
+# (depth, slot): how many parents to follow from the current frame, and
+# which parameter of that frame it is.
+
+
+class Scope:
+    __slots__ = ("params", "parent")
+
+    def __init__(self, params, parent):
+        self.params = params
+        self.parent = parent
+
+    def resolve(self, name):
+        """(depth, slot) of name, or None if no enclosing lambda binds it"""
+        scope = self
+        depth = 0
+        while scope is not None:
+            params = scope.params
+            if name in params:
+                # With a repeated parameter the last binding wins
+                return depth, len(params) - 1 - params[::-1].index(name)
+            scope = scope.parent
+            depth += 1
+        return None
+
+
+def resolve_addresses(control_structures):
+    """Replace NAME instructions bound by a lambda with LOCAL (depth, slot) ones"""
+    # delta0 runs in e0, which binds nothing
+    scopes = {"delta0": None}
+    work = ["delta0"]
+    while work:
+        name = work.pop()
+        scope = scopes[name]
+        items = control_structures.get(name, ())
+        for index, item in enumerate(items):
+            opcode = item.opcode
+            if opcode == LAMBDA:
+                k, params = item.operand
+                body = f"delta{k}"
+                scopes[body] = Scope(params, scope)
+                work.append(body)
+            elif opcode == DELTA:
+                scopes[item.operand] = scope
+                work.append(item.operand)
+            elif opcode == NAME and scope is not None:
+                address = scope.resolve(item.operand)
+                if address is not None:
+                    items[index] = Instruction(LOCAL, address + (item.operand,))
+    return control_structures
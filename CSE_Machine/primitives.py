@@ -0,0 +1,255 @@
+# RPAL's builtin functions and operators. The CSE machine and the closure
+# engine both apply them through a Primitives object, so a program means
+# the same on either.
+
+from CSE_Machine.values import RPALTuple, render
+
+# Binary operators as plain functions, for an engine that applies them
+# without going through apply_binary_operator. Each is the Python operation
+# apply_binary_operator performs; whenever it raises, apply_binary_operator
+# gives the result (its error text).
+BINARY_OPERATOR_FUNCTIONS = {
+    "+": lambda left, right: left + right,
+    "-": lambda left, right: left - right,
+    "*": lambda left, right: left * right,
+    "ls": lambda left, right: left < right,
+    "gr": lambda left, right: left > right,
+    "le": lambda left, right: left <= right,
+    "ge": lambda left, right: left >= right,
+    "eq": lambda left, right: type(left) is type(right) and left == right,
+    "ne": lambda left, right: not (type(left) is type(right) and left == right),
+    "or": lambda left, right: left or right,
+    "&": lambda left, right: left and right,
+}
+
+
+class Primitives:
+    """Builtin functions and operators, printing what they do when
+    trace_details is set"""
+
+    def __init__(self, trace_details=False):
+        # Print what each builtin and operator did (trace level full)
+        self.trace_details = trace_details
+        
+        self.builtins = {
+            # Existing builtins
+            "Print": self._builtin_print,
+            "Order": self._builtin_order,
+            "eq": self._builtin_eq,
+            
+            # Truth value operations
+            "or": self._builtin_or,
+            "not": self._builtin_not,
+            "ne": self._builtin_ne,
+            
+            # Integer operations (additional ones)
+            "**": self._builtin_power,
+            "ls": self._builtin_ls,
+            "gr": self._builtin_gr,
+            "le": self._builtin_le,
+            "ge": self._builtin_ge,
+            "neg": self._builtin_neg,  # NEW: Negation operation
+            
+            # String operations
+            "Stem": self._builtin_stem,
+            "Stern": self._builtin_stern,
+            "Conc": self._builtin_conc,
+        }
+    
+    def _builtin_print(self, value):
+        print(render(value))
+        return value
+    
+    def _builtin_order(self, value):
+        """Returns the length/order of a tuple"""
+        if isinstance(value, RPALTuple):
+            return len(value)
+        else:
+            # Single element (not a tuple)
+            return 1
+    
+    def _builtin_eq(self, val1, val2):
+        """Equality comparison; values of different types are never equal"""
+        result = type(val1) is type(val2) and val1 == val2
+        if self.trace_details:
+            print(f"Eq comparison: {val1} ({type(val1)}) vs {val2} ({type(val2)}) -> {result}")
+        return result
+    
+    # Truth value operations
+    def _builtin_or(self, val1, val2):
+        """Logical OR operation"""
+        result = val1 or val2
+        if self.trace_details:
+            print(f"OR operation: {val1} or {val2} = {result}")
+        return result
+    
+    def _builtin_not(self, value):
+        """Logical NOT operation"""
+        result = not value
+        if self.trace_details:
+            print(f"NOT operation: not {value} = {result}")
+        return result
+    
+    def _builtin_ne(self, val1, val2):
+        """Not equal comparison"""
+        result = not self._builtin_eq(val1, val2)
+        if self.trace_details:
+            print(f"NE comparison: {val1} != {val2} = {result}")
+        return result
+    
+    # Integer operations
+    def _builtin_power(self, val1, val2):
+        """Power operation (**)"""
+        if isinstance(val1, int) and isinstance(val2, int):
+            result = val1 ** val2
+            if self.trace_details:
+                print(f"Power operation: {val1} ** {val2} = {result}")
+            return result
+        else:
+            if self.trace_details:
+                print(f"Power operation failed: {val1} ** {val2} (not numbers)")
+            return f"Error: Cannot compute power of {val1} and {val2}"
+    
+    def _builtin_neg(self, value):
+        """Negation operation - returns negative of a number"""
+        if isinstance(value, int):
+            result = -value
+            if self.trace_details:
+                print(f"Negation operation: neg({value}) = {result}")
+            return result
+        else:
+            if self.trace_details:
+                print(f"Negation operation failed: neg({value}) (not a number)")
+            return f"Error: Cannot negate non-numeric value {value}"
+    
+    def _builtin_ls(self, val1, val2):
+        """Less than operation (ls)"""
+        result = val1 < val2
+        if self.trace_details:
+            print(f"Less than operation: {val1} < {val2} = {result}")
+        return result
+    
+    def _builtin_gr(self, val1, val2):
+        """Greater than operation (gr)"""
+        result = val1 > val2
+        if self.trace_details:
+            print(f"Greater than operation: {val1} > {val2} = {result}")
+        return result
+    
+    def _builtin_le(self, val1, val2):
+        """Less than or equal operation (le)"""
+        result = val1 <= val2
+        if self.trace_details:
+            print(f"Less than or equal operation: {val1} <= {val2} = {result}")
+        return result
+    
+    def _builtin_ge(self, val1, val2):
+        """Greater than or equal operation (ge)"""
+        result = val1 >= val2
+        if self.trace_details:
+            print(f"Greater than or equal operation: {val1} >= {val2} = {result}")
+        return result
+    
+    # String operations
+    def _builtin_stem(self, string_val):
+        """Return the first character of a string (Stem S)"""
+        if isinstance(string_val, str) and len(string_val) > 0:
+            result = string_val[0]
+            if self.trace_details:
+                print(f"Stem operation: Stem({string_val}) = '{result}'")
+            return result
+        else:
+            if self.trace_details:
+                print(f"Stem operation failed: {string_val} is not a valid string")
+            return ""
+    
+    def _builtin_stern(self, string_val):
+        """Remove the first character from a string (Stern S)"""
+        if isinstance(string_val, str):
+            result = string_val[1:]
+            if self.trace_details:
+                print(f"Stern operation: Stern({string_val}) = '{result}'")
+            return result
+        else:
+            if self.trace_details:
+                print(f"Stern operation failed: {string_val} is not a valid string")
+            return ""
+    
+    def _builtin_conc(self, str1, str2):
+        """Concatenate two strings (Conc S T)"""
+        result = str(str1) + str(str2)
+        if self.trace_details:
+            print(f"Conc operation: Conc({str1}, {str2}) = '{result}'")
+        return result
+    
+    def apply_unary_operator(self, operator, operand):
+        """Apply unary operator to one operand"""
+        try:
+            if operator == 'neg':
+                return self._builtin_neg(operand)
+            elif operator == 'not':
+                return self._builtin_not(operand)
+            
+            # Add other unary operators here if needed
+            return f"Unknown unary operator: {operator}"
+                
+        except Exception as e:
+            return f"Error applying unary {operator}: {e}"
+    
+    def apply_binary_operator(self, operator, left, right):
+        """Apply binary operator to two operands (already ints, bools, strings or tuples)"""
+        try:
+            # Handle built-in operations first
+            if operator in ('or', 'eq', 'ne', 'ls', 'gr', 'le', 'ge', '**'):
+                return self.builtins[operator](left, right)
+            
+            if operator == '+':
+                return left + right
+            elif operator == '-':
+                return left - right
+            elif operator == '*':
+                return left * right
+            elif operator == '/':
+                if right != 0:
+                    # Integer division, truncating towards zero
+                    quotient = abs(left) // abs(right)
+                    return quotient if (left < 0) == (right < 0) else -quotient
+                else:
+                    return "Division by zero error"
+            elif operator == '&':
+                return left and right
+            elif operator == 'aug':
+                # Append to a tuple (sharing its storage); nil is the empty tuple
+                if isinstance(left, RPALTuple):
+                    return left.append(right)
+                return f"Cannot augment non-tuple {left}"
+            else:
+                return f"Unknown operator: {operator}"
+                
+        except Exception as e:
+            return f"Error applying {operator}: {e}"
+    
+    def lookup_variable(self, name):
+        """Look up a variable no lambda binds: a builtin, or else a literal"""
+        if name in self.builtins:
+            return self.builtins[name]
+        else:
+            # Treat as literal if not found
+            return name
+    
+    def apply_rator_rand(self, rator, rand):
+        """Apply Rator to Rand"""
+        if callable(rator):
+            try:
+                result = rator(rand)
+                if self.trace_details:
+                    print(f"Applied {rator.__name__ if hasattr(rator, '__name__') else rator} to {rand} = {result}")
+                return result
+            except Exception as e:
+                if self.trace_details:
+                    print(f"Error applying {rator} to {rand}: {e}")
+                return f"Error applying {rator} to {rand}"
+        else:
+            if self.trace_details:
+                print(f"Cannot apply {rator} to {rand} - not callable")
+            return f"Cannot apply {rator} to {rand}"
@@ -0,0 +1,178 @@
+import mmap
+import struct
+import sys
+from array import array
+
+from CSE_Machine.instructions import (
+    Instruction, LAMBDA, TAU, LITERAL, GAMMA_INSTRUCTION, BETA_INSTRUCTION, YSTAR_INSTRUCTION,
+    GAMMA, BETA, YSTAR, LOCAL
+)
+from CSE_Machine.values import NIL, DUMMY
+
+# Compiled program layout (all integers little-endian, unsigned 32-bit
+# unless noted):
+#
+#   header        magic b"RPLC", u16 format version, u16 reserved,
+#                 string count, delta count, code length
+#   string table  string count + 1 offsets into the string data,
+#                 followed by the UTF-8 string data itself
+#   delta index   per delta: name string id, code offset, instruction count
+#   code          every instruction as its opcode followed by its operand
+#                 words, all deltas laid out back to back:
+#                   tau             element count
+#                   lambda          k, parameter count, parameter string ids
+#                   literal         literal kind, then for integers and
+#                                   strings the string id of the value
+#                   local variable  depth, slot, name string id
+#                   gamma, beta, Y  nothing
+#                   anything else   operand string id
+#
+# Every name and literal is interned once in the string table, so the code
+# and the index are plain integer arrays that decode with one copy.
+ARTIFACT_MAGIC = b"RPLC"
+ARTIFACT_VERSION = 4
+OPERANDLESS = {GAMMA: GAMMA_INSTRUCTION, BETA: BETA_INSTRUCTION, YSTAR: YSTAR_INSTRUCTION}
+
+# Literal kinds
+INTEGER_LITERAL, STRING_LITERAL, TRUE_LITERAL, FALSE_LITERAL, NIL_LITERAL, DUMMY_LITERAL = range(6)
+CONSTANT_LITERALS = {TRUE_LITERAL: True, FALSE_LITERAL: False, NIL_LITERAL: NIL, DUMMY_LITERAL: DUMMY}
+HEADER = struct.Struct("<4sHHIII")
+
+
+def _to_bytes(values):
+    if sys.byteorder == "big":
+        values.byteswap()
+    return values.tobytes()
+
+
+def _from_bytes(buffer, offset, count):
+    values = array("I")
+    values.frombytes(buffer[offset:offset + count * values.itemsize])
+    if sys.byteorder == "big":
+        values.byteswap()
+    return values, offset + count * values.itemsize
+
+
+def write_artifact(file_name, control_structures):
+    """Write a control structure table (delta name -> instructions) as a compiled program"""
+    strings = []
+    string_ids = {}
+
+    def intern(value):
+        string_id = string_ids.get(value)
+        if string_id is None:
+            string_id = string_ids[value] = len(strings)
+            strings.append(value)
+        return string_id
+
+    index = array("I")
+    code = array("I")
+    for name, items in control_structures.items():
+        index.extend((intern(name), len(code), len(items)))
+        for item in items:
+            opcode = item.opcode
+            code.append(opcode)
+            if opcode == LAMBDA:
+                k, params = item.operand
+                code.extend((k, len(params)))
+                code.extend(intern(param) for param in params)
+            elif opcode == TAU:
+                code.append(item.operand)
+            elif opcode == LOCAL:
+                depth, slot, name = item.operand
+                code.extend((depth, slot, intern(name)))
+            elif opcode == LITERAL:
+                value = item.operand
+                if value is True:
+                    code.append(TRUE_LITERAL)
+                elif value is False:
+                    code.append(FALSE_LITERAL)
+                elif isinstance(value, int):
+                    code.extend((INTEGER_LITERAL, intern(str(value))))
+                elif isinstance(value, str):
+                    code.extend((STRING_LITERAL, intern(value)))
+                elif value is DUMMY:
+                    code.append(DUMMY_LITERAL)
+                else:
+                    code.append(NIL_LITERAL)
+            elif opcode not in OPERANDLESS:
+                code.append(intern(item.operand))
+
+    string_data = bytearray()
+    offsets = array("I", [0])
+    for value in strings:
+        string_data += value.encode()
+        offsets.append(len(string_data))
+
+    with open(file_name, "wb") as artifact:
+        artifact.write(HEADER.pack(ARTIFACT_MAGIC, ARTIFACT_VERSION, 0,
+                                   len(strings), len(control_structures), len(code)))
+        artifact.write(_to_bytes(offsets))
+        artifact.write(string_data)
+        artifact.write(_to_bytes(index))
+        artifact.write(_to_bytes(code))
+
+
+def is_artifact(file_name):
+    with open(file_name, "rb") as artifact:
+        return artifact.read(len(ARTIFACT_MAGIC)) == ARTIFACT_MAGIC
+
+
+def load_artifact(file_name):
+    """Decode a compiled program back into its control structure table"""
+    with open(file_name, "rb") as artifact:
+        buffer = mmap.mmap(artifact.fileno(), 0, access=mmap.ACCESS_READ)
+    try:
+        magic, version, _, string_count, delta_count, code_length = HEADER.unpack_from(buffer, 0)
+        if magic != ARTIFACT_MAGIC:
+            raise ValueError(f"{file_name} is not a compiled RPAL program")
+        if version != ARTIFACT_VERSION:
+            raise ValueError(f"{file_name} has format version {version}, "
+                             f"expected {ARTIFACT_VERSION}; recompile it")
+
+        offsets, position = _from_bytes(buffer, HEADER.size, string_count + 1)
+        string_data = buffer[position:position + offsets[-1]]
+        strings = [string_data[offsets[i]:offsets[i + 1]].decode() for i in range(string_count)]
+        position += offsets[-1]
+
+        index, position = _from_bytes(buffer, position, delta_count * 3)
+        code, position = _from_bytes(buffer, position, code_length)
+    finally:
+        buffer.close()
+
+    control_structures = {}
+    for i in range(0, len(index), 3):
+        name_id, position, count = index[i], index[i + 1], index[i + 2]
+        items = []
+        for _ in range(count):
+            opcode = code[position]
+            position += 1
+            if opcode in OPERANDLESS:
+                items.append(OPERANDLESS[opcode])
+            elif opcode == LAMBDA:
+                k, param_count = code[position], code[position + 1]
+                position += 2
+                params = tuple(strings[string_id] for string_id in code[position:position + param_count])
+                position += param_count
+                items.append(Instruction(LAMBDA, (k, params)))
+            elif opcode == TAU:
+                items.append(Instruction(TAU, code[position]))
+                position += 1
+            elif opcode == LOCAL:
+                depth, slot = code[position], code[position + 1]
+                items.append(Instruction(LOCAL, (depth, slot, strings[code[position + 2]])))
+                position += 3
+            elif opcode == LITERAL:
+                kind = code[position]
+                position += 1
+                if kind in CONSTANT_LITERALS:
+                    items.append(Instruction(LITERAL, CONSTANT_LITERALS[kind]))
+                else:
+                    value = strings[code[position]]
+                    position += 1
+                    items.append(Instruction(LITERAL, int(value) if kind == INTEGER_LITERAL else value))
+            else:
+                items.append(Instruction(opcode, strings[code[position]]))
+                position += 1
+        control_structures[strings[name_id]] = items
+    return control_structures
@@ -0,0 +1,192 @@
+# Runtime values of the CSE machine that need more than a plain Python
+# object, and how Print renders them.
+
+BITS = 5
+WIDTH = 1 << BITS  # children per trie node, elements per leaf
+MASK = WIDTH - 1
+
+
+class RPALTuple:
+    """Immutable RPAL tuple stored as a persistent vector.
+
+    Elements live in a trie of WIDTH-wide nodes plus a tail buffer holding
+    the last (up to WIDTH) elements. aug never changes a tuple: it returns
+    a new one that shares the trie, and the tail too when nothing has been
+    appended past the end of the original yet - each tuple only reads the
+    first count elements, so slots past its end are invisible to it. A
+    chain of aug is therefore O(1) amortized per element, and indexing is
+    a walk of at most a few trie levels."""
+    __slots__ = ("count", "shift", "root", "tail")
+
+    def __init__(self, count=0, shift=BITS, root=None, tail=None):
+        self.count = count
+        self.shift = shift
+        self.root = root if root is not None else []
+        self.tail = tail if tail is not None else []
+
+    @classmethod
+    def from_sequence(cls, elements):
+        elements = list(elements)
+        if len(elements) <= WIDTH:
+            return cls(len(elements), BITS, [], elements)
+        result = cls()
+        for element in elements:
+            result = result.append(element)
+        return result
+
+    def _tail_offset(self):
+        count = self.count
+        if count < WIDTH:
+            return 0
+        return ((count - 1) >> BITS) << BITS
+
+    def append(self, value):
+        """The tuple extended by one element (RPAL aug)"""
+        count = self.count
+        tail = self.tail
+        used = count - self._tail_offset()
+
+        if used < WIDTH:
+            if count and len(tail) == used:
+                tail.append(value)  # nobody has used the slots past our end
+            else:
+                tail = tail[:used]
+                tail.append(value)
+            return RPALTuple(count + 1, self.shift, self.root, tail)
+
+        # The tail is full: it becomes a leaf of the trie
+        shift = self.shift
+        if (count >> BITS) > (1 << shift):
+            root = [self.root, _new_path(shift, tail)]
+            shift += BITS
+        else:
+            root = _push_tail(count, shift, self.root, tail)
+        return RPALTuple(count + 1, shift, root, [value])
+
+    def __len__(self):
+        return self.count
+
+    def __getitem__(self, index):
+        if not 0 <= index < self.count:
+            raise IndexError("tuple index out of range")
+        offset = self._tail_offset()
+        if index >= offset:
+            return self.tail[index - offset]
+        node = self.root
+        for level in range(self.shift, 0, -BITS):
+            node = node[(index >> level) & MASK]
+        return node[index & MASK]
+
+    def __iter__(self):
+        offset = self._tail_offset()
+        for start in range(0, offset, WIDTH):
+            node = self.root
+            for level in range(self.shift, 0, -BITS):
+                node = node[(start >> level) & MASK]
+            yield from node
+        yield from self.tail[:self.count - offset]
+
+    def __eq__(self, other):
+        if not isinstance(other, RPALTuple):
+            return NotImplemented
+        return self.count == other.count and all(a == b for a, b in zip(self, other))
+
+    __hash__ = None
+
+    def __repr__(self):
+        return render(self)
+
+
+def _new_path(level, node):
+    while level:
+        node = [node]
+        level -= BITS
+    return node
+
+
+def _push_tail(count, level, parent, tail):
+    # Path-copy the spine down to where the leaf for the elements before
+    # index count belongs, and hang the full tail there
+    subindex = ((count - 1) >> level) & MASK
+    node = parent[:]
+    if level == BITS:
+        child = tail
+    elif subindex < len(parent):
+        child = _push_tail(count, level - BITS, parent[subindex], tail)
+    else:
+        child = _new_path(level - BITS, tail)
+    if subindex < len(node):
+        node[subindex] = child
+    else:
+        node.append(child)
+    return node
+
+
+NIL = RPALTuple()
+
+
+class Dummy:
+    """The value of RPAL's dummy"""
+    __slots__ = ()
+
+    def __repr__(self):
+        return "dummy"
+
+    def __reduce__(self):
+        return "DUMMY"  # unpickles as the module's singleton
+
+
+DUMMY = Dummy()
+
+
+class YCombinator:
+    """The Y the standardizer puts in front of recursive definitions"""
+    __slots__ = ()
+
+    def __repr__(self):
+        return "Y"
+
+    def __reduce__(self):
+        return "Y_COMBINATOR"
+
+
+Y_COMBINATOR = YCombinator()
+
+
+class Closure:
+    """lambda closure: parameters and body delta k, closed over env"""
+    __slots__ = ("k", "params", "env")
+
+    def __init__(self, k, params, env):
+        self.k = k
+        self.params = params
+        self.env = env
+
+    def __repr__(self):
+        return f"[lambda closure: {','.join(self.params)}: {self.k}]"
+
+
+class Eta:
+    """What Y turns a closure into; applying it unrolls one recursion step"""
+    __slots__ = ("k", "params", "env")
+
+    def __init__(self, k, params, env):
+        self.k = k
+        self.params = params
+        self.env = env
+
+    def __repr__(self):
+        return f"[eta closure: {','.join(self.params)}: {self.k}]"
+
+
+def render(value):
+    """Text of a value as Print shows it"""
+    if value is True:
+        return "true"
+    if value is False:
+        return "false"
+    if isinstance(value, RPALTuple):
+        if not value.count:
+            return "nil"
+        return f"({', '.join(render(element) for element in value)})"
+    return str(value)
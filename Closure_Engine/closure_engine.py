@@ -0,0 +1,279 @@
+import sys
+
+from CSE_Machine.instructions import (
+    leaf_instruction, NAME, LITERAL, YSTAR, UNARY_OPERATOR, BINARY_OPERATOR
+)
+from CSE_Machine.lexical_addressing import Scope
+from CSE_Machine.primitives import Primitives, BINARY_OPERATOR_FUNCTIONS
+from CSE_Machine.values import RPALTuple, NIL, Closure, Eta, Y_COMBINATOR
+
+# Closure-compiling execution engine.
+#
+# Instead of flattening the standardized tree into control structures and
+# interpreting them one instruction at a time, every node is compiled once
+# into a Python function of the environment that evaluates it, built from
+# the functions of its children. Running the program is one call of the
+# root's function: there is no control, no value stack and no opcode
+# dispatch.
+#
+# Evaluation follows the CSE machine: side effects happen in the same order
+# (the rand of a gamma, the right operand of an operator and the last tuple
+# element are evaluated first), lambdas get the same k that closures print
+# with, and builtins and operators are the same Primitives. An environment
+# is a list [parent, value, ...] holding the values in the slots lexical
+# addressing gives the parameters. A gamma in tail position hands a
+# TailCall back to the application loop instead of applying, so tail
+# recursion runs in constant Python stack; other recursion of the RPAL
+# program is Python recursion.
+
+TOO_DEEP = "Error: program nests too deeply for the closure engine; run it with -engine cse"
+
+
+class TailCall:
+    """An application a lambda body left to the caller's application loop"""
+    __slots__ = ("rator", "rand")
+
+    def __init__(self, rator, rand):
+        self.rator = rator
+        self.rand = rand
+
+
+class ClosureEngine:
+    # The Python stack grows with the nesting of the program and the depth
+    # of its non-tail recursion, so the limit is raised while compiling and
+    # running
+    recursion_limit = 200_000
+
+    # As CSEMachine.direct_recursion: tie Y's knot directly when it can
+    direct_recursion = True
+
+    def __init__(self, root):
+        self.primitives = Primitives()
+        self.bodies = {}     # compiled lambda bodies, by k
+        self.knots = set()   # k of the lambdas whose body is a lambda (see apply_y)
+        self.counter = 0     # numbers lambdas and conditionals like the generator
+        try:
+            self.program = self._with_recursion_limit(self._compile, root, None, False)
+        except RecursionError:
+            print(TOO_DEEP)
+            self.program = None
+
+    def _with_recursion_limit(self, function, *args):
+        limit = sys.getrecursionlimit()
+        sys.setrecursionlimit(max(limit, self.recursion_limit))
+        try:
+            return function(*args)
+        finally:
+            sys.setrecursionlimit(limit)
+
+    def run(self):
+        """Evaluate the program and return its value"""
+        if self.program is None:
+            return None
+        try:
+            return self._with_recursion_limit(self.program, None)
+        except RecursionError:
+            print(TOO_DEEP)
+            return None
+
+    def _compile(self, node, scope, tail):
+        """Function of the environment that evaluates node; tail is whether
+        node is in tail position of a lambda body"""
+        value = node.value
+        if value == "lambda":
+            return self._compile_lambda(node, scope)
+        if value == "gamma":
+            return self._compile_gamma(node, scope, tail)
+        if value == "->":
+            return self._compile_conditional(node, scope, tail)
+        if value == "tau":
+            return self._compile_tau(node, scope)
+
+        instruction = leaf_instruction(value)
+        opcode = instruction.opcode
+        if opcode == BINARY_OPERATOR:
+            return self._compile_binary_operator(node, scope)
+        if opcode == UNARY_OPERATOR:
+            return self._compile_unary_operator(node, scope)
+        if opcode == NAME:
+            address = scope.resolve(value) if scope is not None else None
+            if address is not None:
+                return self._compile_local(*address)
+            constant = self.primitives.lookup_variable(value)
+        elif opcode == YSTAR:
+            constant = Y_COMBINATOR
+        else:
+            assert opcode == LITERAL
+            constant = instruction.operand
+
+        def literal(env):
+            return constant
+        return literal
+
+    def _compile_lambda(self, node, scope):
+        # Parameters as ControlStructureGenerator reads them
+        self.counter += 1
+        k = self.counter
+        if len(node.children) >= 2 and node.children[0].value == ",":
+            comma_node = node.children[0]
+            params = tuple(child.value for child in comma_node.children) if len(comma_node.children) >= 2 else ()
+        else:
+            params = (node.children[0].value,)
+        body = node.children[1]
+
+        if len(params) == 1 and body.value == "lambda":
+            self.knots.add(k)
+        self.bodies[k] = self._compile(body, Scope(params, scope), True)
+
+        def make_closure(env):
+            return Closure(k, params, env)
+        return make_closure
+
+    def _compile_gamma(self, node, scope, tail):
+        rator = self._compile(node.children[0], scope, False)
+        rand = self._compile(node.children[1], scope, False)
+
+        if tail:
+            def tail_call(env):
+                argument = rand(env)
+                return TailCall(rator(env), argument)
+            return tail_call
+
+        apply = self.apply
+
+        def gamma(env):
+            argument = rand(env)
+            return apply(rator(env), argument)
+        return gamma
+
+    def _compile_conditional(self, node, scope, tail):
+        # One number for each branch, as they are deltas of their own there
+        self.counter += 2
+        cond_node, true_node, false_node = node.children
+        condition = self._compile(cond_node, scope, False)
+        then = self._compile(true_node, scope, tail)
+        otherwise = self._compile(false_node, scope, tail)
+
+        def conditional(env):
+            if condition(env) is True:
+                return then(env)
+            return otherwise(env)
+        return conditional
+
+    def _compile_tau(self, node, scope):
+        elements = [self._compile(child, scope, False) for child in node.children]
+        if not elements:
+            def empty(env):
+                return NIL
+            return empty
+
+        # The last element is evaluated first
+        elements.reverse()
+        from_sequence = RPALTuple.from_sequence
+
+        def tau(env):
+            values = [element(env) for element in elements]
+            values.reverse()
+            return from_sequence(values)
+        return tau
+
+    def _compile_binary_operator(self, node, scope):
+        operator = node.value
+        left = self._compile(node.children[0], scope, False)
+        right = self._compile(node.children[1], scope, False)
+        apply_binary_operator = self.primitives.apply_binary_operator
+        function = BINARY_OPERATOR_FUNCTIONS.get(operator)
+
+        if function is None:
+            def binary(env):
+                right_value = right(env)
+                return apply_binary_operator(operator, left(env), right_value)
+            return binary
+
+        def fast_binary(env):
+            right_value = right(env)
+            left_value = left(env)
+            try:
+                return function(left_value, right_value)
+            except Exception:
+                return apply_binary_operator(operator, left_value, right_value)
+        return fast_binary
+
+    def _compile_unary_operator(self, node, scope):
+        operator = node.value
+        operand = self._compile(node.children[0], scope, False)
+        apply_unary_operator = self.primitives.apply_unary_operator
+
+        def unary(env):
+            return apply_unary_operator(operator, operand(env))
+        return unary
+
+    def _compile_local(self, depth, slot):
+        # Slot 0 of an environment is its parent
+        slot += 1
+        if depth == 0:
+            def local(env):
+                return env[slot]
+        elif depth == 1:
+            def local(env):
+                return env[0][slot]
+        else:
+            def local(env):
+                for _ in range(depth):
+                    env = env[0]
+                return env[slot]
+        return local
+
+    def apply(self, rator, rand):
+        """Value of rator applied to rand (gamma)"""
+        bodies = self.bodies
+        while True:
+            if type(rator) is Closure:
+                # Rule 4: bind the parameters in a new environment
+                params = rator.params
+                if len(params) == 1:
+                    env = [rator.env, rand]
+                else:
+                    elements = rand if isinstance(rand, RPALTuple) else (rand,)
+                    env = [rator.env]
+                    for i in range(len(params)):
+                        env.append(elements[i] if i < len(elements) else None)
+                result = bodies[rator.k](env)
+                if type(result) is TailCall:
+                    # A tail call of the body: apply it here
+                    rator, rand = result.rator, result.rand
+                    continue
+                return result
+
+            if type(rator) is Eta:
+                # Rule 7: apply the lambda to the eta, then the result to rand
+                rator = self.apply(Closure(rator.k, rator.params, rator.env), rator)
+                continue
+
+            if isinstance(rator, RPALTuple):
+                return self._select(rator, rand)
+            if rator is Y_COMBINATOR:
+                return self.apply_y(rand)
+            return self.primitives.apply_rator_rand(rator, rand)
+
+    def apply_y(self, closure):
+        """Value of Y applied to closure (lambda f. E), as in CSEMachine.apply_y"""
+        if not isinstance(closure, Closure):
+            return Y_COMBINATOR
+        if self.direct_recursion and closure.k in self.knots:
+            env = [closure.env, None]
+            function = self.bodies[closure.k](env)
+            env[1] = function
+            return function
+        return Eta(closure.k, closure.params, closure.env)
+
+    def _select(self, elements, index):
+        # Tuple indexing is 1-based; a bad index selects nil (None)
+        try:
+            if isinstance(index, str):
+                index = int(index)
+            if 1 <= index <= len(elements):
+                return elements[index - 1]
+            return None
+        except (ValueError, TypeError):
+            return None
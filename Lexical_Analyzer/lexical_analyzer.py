@@ -1,4 +1,9 @@
+import mmap
+import os
 import re
+from array import array
+from sys import intern
+from collections import deque
 from enum import Enum
 
 class TokenType(Enum):
@@ -26,46 +31,256 @@ class MyToken:
 
 
 
+# Keywords are matched as identifiers first and then looked up here.
+KEYWORDS = frozenset([
+    'let', 'in', 'fn', 'where', 'aug', 'or', 'not', 'gr', 'ge', 'ls', 'le',
+    'eq', 'ne', 'true', 'false', 'nil', 'dummy', 'within', 'and', 'rec'
+])
+
+# One combined pattern for every token class. The alternatives are tried in
+# order, so COMMENT has to come before OPERATOR ('//' is also an operator).
+# MISMATCH catches any single character no other class accepts.
+TOKEN_PATTERN_SOURCE = '|'.join([
+    r'(?P<COMMENT>//.*)',
+    r'(?P<STRING>\'(?:\\\'|[^\'])*\')',
+    r'(?P<IDENTIFIER>[a-zA-Z][a-zA-Z0-9_]*)',
+    r'(?P<INTEGER>\d+)',
+    r'(?P<OPERATOR>[+\-*<>&.@/:=~|$\#!%^_\[\]{}"\'?]+)',
+    r'(?P<SPACES>[ \t\r\n]+)',
+    r'(?P<PUNCTUATION>[();,])',
+    r'(?P<MISMATCH>[\s\S])',
+])
+TOKEN_PATTERN = re.compile(TOKEN_PATTERN_SOURCE)
+# Same pattern for scanning raw bytes, e.g. a memory-mapped source file
+BYTES_TOKEN_PATTERN = re.compile(TOKEN_PATTERN_SOURCE.encode())
+
+# Token type produced by each group of TOKEN_PATTERN; None means skip it
+GROUP_TOKEN_TYPES = {
+    'COMMENT': None,
+    'STRING': TokenType.STRING,
+    'IDENTIFIER': TokenType.IDENTIFIER,
+    'INTEGER': TokenType.INTEGER,
+    'OPERATOR': TokenType.OPERATOR,
+    'SPACES': None,
+    'PUNCTUATION': TokenType.PUNCTUATION,
+}
+
+
+def _decode(value):
+    # Raw bytes of a lexeme as the text a source file opened in text mode
+    # would give: \r\n and lone \r line breaks (inside a string literal)
+    # read as \n
+    value = value.decode()
+    if "\r" in value:
+        value = value.replace("\r\n", "\n").replace("\r", "\n")
+    return value
+
+
+class TokenScan:
+    """Tokens of a scan, produced lazily as they are iterated.
+
+    errors records whether the scan came across input it could not
+    tokenize; it is only complete once the tokens have been consumed.
+    """
+
+    def __init__(self, matches, decode=False):
+        self.matches = matches
+        self.decode = decode
+        self.errors = False
+
+    def __iter__(self):
+        identifier = TokenType.IDENTIFIER
+        keyword = TokenType.KEYWORD
+        decode = self.decode
+
+        for match in self.matches:
+            kind = match.lastgroup
+            if kind == 'MISMATCH':
+                print("Error: Unable to tokenize input")
+                self.errors = True
+                continue
+            token_type = GROUP_TOKEN_TYPES[kind]
+            if token_type is None:
+                continue
+            value = match.group()
+            if decode:
+                value = _decode(value)
+            if token_type is identifier:
+                if value in KEYWORDS:
+                    token_type = keyword
+                # Share one string per name across all tokens and tree nodes
+                value = intern(value)
+            yield MyToken(token_type, value)
+
+
+def generate_tokens(input_str):
+    """Tokens of input_str, produced lazily one at a time.
+
+    The regex engine walks the source by position instead of the scanner
+    slicing off the consumed prefix, so the whole pass is linear in the
+    input size.
+    """
+    return TokenScan(TOKEN_PATTERN.finditer(input_str))
+
+
+def stream_tokens(file_name):
+    """Tokens of a source file, scanned without reading it into memory.
+
+    The file is memory-mapped and scanned in place, so only the tokens the
+    consumer still holds on to stay alive.
+    """
+    with open(file_name, "rb") as source_file:
+        if os.fstat(source_file.fileno()).st_size == 0:
+            return TokenScan(iter(()))
+        # The map keeps its own handle, so the file itself can be closed here
+        source = mmap.mmap(source_file.fileno(), 0, access=mmap.ACCESS_READ)
+    return TokenScan(BYTES_TOKEN_PATTERN.finditer(source), decode=True)
+
+
 def tokenize(input_str):
-    tokens = []
-    keywords = {
-        'COMMENT': r'//.*',
-        'KEYWORD': r'(let|in|fn|where|aug|or|not|gr|ge|ls|le|eq|ne|true|false|nil|dummy|within|and|rec)\b',
-        'STRING': r'\'(?:\\\'|[^\'])*\'',
-        'IDENTIFIER': r'[a-zA-Z][a-zA-Z0-9_]*',
-        'INTEGER': r'\d+',
-        'OPERATOR': r'[+\-*<>&.@/:=~|$\#!%^_\[\]{}"\'?]+',
-        'SPACES': r'[ \t\n]+',
-        'PUNCTUATION': r'[();,]'
-    }
-    
-    while input_str:
-        matched = False
-        for key, pattern in keywords.items():
-            match = re.match(pattern, input_str)
-            if match:
-                # print(key, match.group(0))
-                if key != 'SPACES':
-                    if key == 'COMMENT':
-                        comment = match.group(0)
-                        input_str = input_str[match.end():]
-                        matched = True
-                        break
-                    else:
-                        token_type = getattr(TokenType, key)  # Get TokenType enum value
-                        if not isinstance(token_type, TokenType):
-                            raise ValueError(f"Token type '{key}' is not a valid TokenType")
-                        tokens.append(MyToken(token_type, match.group(0)))
-                        input_str = input_str[match.end():]
-                        matched = True
-                        break
-                input_str = input_str[match.end():]
-                matched = True
-                break
-        if not matched:
+    return list(generate_tokens(input_str))
+
+
+class CompactTokens:
+    """Array-backed token stream over the original source.
+
+    Instead of one MyToken object per token it keeps three parallel arrays:
+    the TokenType code and the start/end offsets of the lexeme. Lexemes are
+    sliced out of the source only when a token is accessed. Indexing and
+    iteration hand out ordinary MyToken objects, so show_tokens and
+    RPALParser (through a TokenCursor) can consume it like a token list.
+    """
+
+    def __init__(self, source):
+        self.source = source
+        self.decode = not isinstance(source, str)
+        offset_code = 'I' if len(source) <= 0xFFFFFFFF else 'Q'
+        self.types = array('B')
+        self.starts = array(offset_code)
+        self.ends = array(offset_code)
+        # Whether compact_tokenize came across input it could not tokenize
+        self.errors = False
+
+    def __len__(self):
+        return len(self.types)
+
+    def type_at(self, index):
+        return TokenType(self.types[index])
+
+    def value_at(self, index):
+        value = self.source[self.starts[index]:self.ends[index]]
+        return _decode(value) if self.decode else value
+
+    def __getitem__(self, index):
+        if index < 0:
+            index += len(self.types)
+        return MyToken(self.type_at(index), self.value_at(index))
+
+    def __iter__(self):
+        for index in range(len(self.types)):
+            yield MyToken(self.type_at(index), self.value_at(index))
+
+
+def compact_tokenize(source):
+    """Tokenize source (a str, bytes or mmap) into a CompactTokens stream."""
+    tokens = CompactTokens(source)
+    pattern = TOKEN_PATTERN if isinstance(source, str) else BYTES_TOKEN_PATTERN
+    keywords = KEYWORDS if isinstance(source, str) else {k.encode() for k in KEYWORDS}
+    add_type = tokens.types.append
+    add_start = tokens.starts.append
+    add_end = tokens.ends.append
+    identifier = TokenType.IDENTIFIER
+
+    for match in pattern.finditer(source):
+        kind = match.lastgroup
+        if kind == 'MISMATCH':
             print("Error: Unable to tokenize input")
+            tokens.errors = True
+            continue
+        token_type = GROUP_TOKEN_TYPES[kind]
+        if token_type is None:
+            continue
+        if token_type is identifier and match.group() in keywords:
+            token_type = TokenType.KEYWORD
+        add_type(token_type.value)
+        add_start(match.start())
+        add_end(match.end())
     return tokens
 
+
+# Returned by token cursors once the input is exhausted
+END_TOKEN = MyToken(TokenType.END_OF_TOKENS, "")
+
+
+class TokenCursor:
+    """Forward cursor over an indexable token sequence.
+
+    peek(k) looks k tokens ahead of the current position and advance()
+    consumes one token; both are O(1) and leave the sequence untouched.
+    Past the end both return END_TOKEN. Iterating yields the tokens that
+    are still unconsumed followed by END_TOKEN.
+    """
+
+    def __init__(self, tokens):
+        self.tokens = tokens
+        self.length = len(tokens)
+        self.position = 0
+
+    def peek(self, k=0):
+        index = self.position + k
+        if index < self.length:
+            return self.tokens[index]
+        return END_TOKEN
+
+    def advance(self):
+        index = self.position
+        if index < self.length:
+            self.position = index + 1
+            return self.tokens[index]
+        return END_TOKEN
+
+    def __iter__(self):
+        while self.position < self.length:
+            yield self.advance()
+        yield END_TOKEN
+
+
+class TokenBuffer:
+    """Token cursor that pulls tokens from an iterator on demand.
+
+    Offers the same peek(k)/advance() interface as TokenCursor, but only
+    the tokens looked ahead at are buffered, so a parser can consume a
+    token generator without materialising it.
+    """
+
+    def __init__(self, tokens):
+        self.source = iter(tokens)
+        self.lookahead = deque()
+
+    def _fill(self, count):
+        while len(self.lookahead) < count:
+            token = next(self.source, None)
+            if token is None:
+                return False
+            self.lookahead.append(token)
+        return True
+
+    def peek(self, k=0):
+        if self._fill(k + 1):
+            return self.lookahead[k]
+        return END_TOKEN
+
+    def advance(self):
+        if self._fill(1):
+            return self.lookahead.popleft()
+        return END_TOKEN
+
+    def __iter__(self):
+        while self._fill(1):
+            yield self.lookahead.popleft()
+        yield END_TOKEN
+
+
 def show_tokens(tokens):
     for token in tokens:
         print(f'<{token.get_type()}: {token.get_value()}>')
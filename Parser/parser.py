@@ -1,5 +1,5 @@
 from enum import Enum
-from Lexical_Analyzer.lexical_analyzer import TokenType, MyToken
+from Lexical_Analyzer.lexical_analyzer import TokenType, TokenBuffer, TokenCursor, CompactTokens
 
 class ASTNodeType(Enum):
     let = 1
@@ -36,69 +36,128 @@ class ASTNodeType(Enum):
     empty_params = 32
 
 class ASTNode:
-    def __init__(self, node_type, value, children):
+    # Same shape as Standardizer.TreeNode (value + children), so the parsed
+    # tree can be handed to standardize_tree directly. Slots instead of a
+    # per-instance __dict__ keep large trees small.
+    __slots__ = ("type", "value", "children")
+
+    def __init__(self, node_type, value, children=()):
         self.type = node_type
         self.value = value
-        self.no_of_children = children
+        self.children = children  # Leaves all share the empty tuple
+
+    def add_child(self, child_node):
+        if not self.children:
+            self.children = []
+        self.children.append(child_node)
+
+# Binary operators of the B/A/At/Af/Ap levels for precedence climbing:
+# token value -> (precedence, node type, node value)
+BINARY_OPERATORS = {
+    "or": (1, ASTNodeType.op_or, "or"),
+    "&": (2, ASTNodeType.op_and, "&"),
+    ">": (4, ASTNodeType.op_compare, "gr"),
+    ">=": (4, ASTNodeType.op_compare, "ge"),
+    "<": (4, ASTNodeType.op_compare, "ls"),
+    "<=": (4, ASTNodeType.op_compare, "le"),
+    "gr": (4, ASTNodeType.op_compare, "gr"),
+    "ge": (4, ASTNodeType.op_compare, "ge"),
+    "ls": (4, ASTNodeType.op_compare, "ls"),
+    "le": (4, ASTNodeType.op_compare, "le"),
+    "eq": (4, ASTNodeType.op_compare, "eq"),
+    "ne": (4, ASTNodeType.op_compare, "ne"),
+    "+": (5, ASTNodeType.op_plus, "+"),
+    "-": (5, ASTNodeType.op_minus, "-"),
+    "*": (6, ASTNodeType.op_mul, "*"),
+    "/": (6, ASTNodeType.op_div, "/"),
+    "**": (7, ASTNodeType.op_pow, "**"),
+    "@": (8, ASTNodeType.at, "@"),
+}
+NOT_PRECEDENCE = 3       # 'not' Bp
+COMPARE_PRECEDENCE = 4   # A relop A, non-associative
+SIGN_PRECEDENCE = 5      # unary '+' / '-' At
+POWER_PRECEDENCE = 7     # right associative
+AT_PRECEDENCE = 8
+GAMMA_PRECEDENCE = 9     # application by juxtaposition (R Rn)
+
+# Tokens that can start an Rn operand
+RAND_TOKEN_TYPES = (TokenType.IDENTIFIER, TokenType.INTEGER, TokenType.STRING)
+RAND_KEYWORDS = ("true", "false", "nil", "dummy", "(")
+
 
 class RPALParser:
+    # Parse the operator levels B ... R with parse_operator_expression instead
+    # of the one-method-per-level recursive descent chain below
+    use_precedence_climbing = True
+
     def __init__(self, tokens):
-        self.tokens = tokens
+        # Token sequences are walked by index; anything else (e.g. a token
+        # generator) is pulled lazily through a lookahead buffer
+        if isinstance(tokens, (list, tuple, CompactTokens)):
+            self.tokens = TokenCursor(tokens)
+        elif isinstance(tokens, (TokenCursor, TokenBuffer)):
+            self.tokens = tokens
+        else:
+            self.tokens = TokenBuffer(tokens)
+        # peek(k) looks k tokens ahead, advance() consumes the current token
+        self.peek = self.tokens.peek
+        self.advance = self.tokens.advance
         self.syntax_tree = []
         self.tree_strings = []
+        # Set once a syntax error has been reported
+        self.errors = False
 
     def build_ast(self):
-        self.tokens.append(MyToken(TokenType.END_OF_TOKENS, ""))  # Append end marker
-        self.parse_expression()  # Begin parsing from root
-        if self.tokens[0].type == TokenType.END_OF_TOKENS:
-            return self.syntax_tree
+        self.run_parser(self.parse_expression())  # Begin parsing from root
+        if self.peek().type == TokenType.END_OF_TOKENS:
+            return self.syntax_tree[-1] if self.syntax_tree else None
         else:
-            print("Error: Parsing failed!...........")
+            self.report("Error: Parsing failed!...........")
             print("TOKENS NOT PROCESSED:")
             for token in self.tokens:
                 print("<" + str(token.type) + ", " + token.value + ">")
             return None
 
+    def report(self, message):
+        print(message)
+        self.errors = True
+
+    def run_parser(self, parse_method):
+        '''
+        The parse_* methods that descend into other nonterminals are
+        generators: instead of calling a sub-parser directly they yield its
+        generator, and this loop runs it on an explicit stack before resuming
+        the caller. Nesting depth is therefore limited by memory rather than
+        by the Python recursion limit.
+        '''
+        pending = [parse_method]
+        while pending:
+            try:
+                pending.append(next(pending[-1]))
+            except StopIteration:
+                pending.pop()
+
+    def build_node(self, node_type, value, child_count):
+        # The last child_count finished nodes become the children of the new one
+        if child_count:
+            children = self.syntax_tree[-child_count:]
+            del self.syntax_tree[-child_count:]
+            self.syntax_tree.append(ASTNode(node_type, value, children))
+        else:
+            self.syntax_tree.append(ASTNode(node_type, value))
+
     def generate_string_representation(self):
-        indentation = ""
-        node_stack = []
-
-        while self.syntax_tree:
-            if not node_stack:
-                if self.syntax_tree[-1].no_of_children == 0:
-                    self.append_node_string(indentation, self.syntax_tree.pop())
-                else:
-                    current_node = self.syntax_tree.pop()
-                    node_stack.append(current_node)
-            else:
-                if self.syntax_tree[-1].no_of_children > 0:
-                    current_node = self.syntax_tree.pop()
-                    node_stack.append(current_node)
-                    indentation += "."
-                else:
-                    node_stack.append(self.syntax_tree.pop())
-                    indentation += "."
-                    while node_stack[-1].no_of_children == 0:
-                        self.append_node_string(indentation, node_stack.pop())
-                        if not node_stack:
-                            break
-                        indentation = indentation[:-1]
-                        current_node = node_stack.pop()
-                        current_node.no_of_children -= 1
-                        node_stack.append(current_node)
-
-        # Reverse the final list
-        self.tree_strings.reverse()
-        return self.tree_strings
+        # Dotted pre-order listing of the tree, one node per line (-ast output)
+        self.tree_strings = []
+        node_stack = [(self.syntax_tree[-1], "")] if self.syntax_tree else []
 
-    def append_node_string(self, indentation, node):
-        if node.type in [ASTNodeType.identifier, ASTNodeType.integer, ASTNodeType.string, ASTNodeType.true_value,
-                         ASTNodeType.false_value, ASTNodeType.nil, ASTNodeType.dummy]:
-            self.tree_strings.append(indentation + node.value)
-        elif node.type == ASTNodeType.fcn_form:
-            self.tree_strings.append(indentation + "function_form")
-        else:
+        while node_stack:
+            node, indentation = node_stack.pop()
             self.tree_strings.append(indentation + node.value)
+            for child in reversed(node.children):
+                node_stack.append((child, indentation + "."))
+
+        return self.tree_strings
 
     # Main Expression Parsing Methods
                 
@@ -107,49 +166,42 @@ class RPALParser:
     # 	->Ew;
 
     def parse_expression(self):
-        if self.tokens:  # Check if tokens exist
-            current_token = self.tokens[0]
-            if hasattr(current_token, 'type') and hasattr(current_token, 'value'):  # Validate token structure
-                if current_token.type == TokenType.KEYWORD and current_token.value in ["let", "fn"]:
-                    # print('Processing keyword expression...')
-                    if current_token.value == "let":
-                        # print('Processing let expression...')
-                        self.tokens.pop(0)  # Consume "let"
-                        self.parse_definition()
-                        if self.tokens[0].value != "in":
-                            print("Syntax error in expression parsing: 'in' keyword expected")
-                        self.tokens.pop(0)  # Consume "in"
-                        self.parse_expression()
-                        self.syntax_tree.append(ASTNode(ASTNodeType.let, "let", 2))
-                    else:
-                        self.tokens.pop(0)  # Consume "fn"
-                        param_count = 0
-                        while self.tokens and (self.tokens[0].type == TokenType.IDENTIFIER or self.tokens[0].value == "("):
-                            self.parse_variable_binding()
-                            param_count += 1
-                        if self.tokens and self.tokens[0].value != ".":
-                            print("Syntax error in expression parsing: '.' expected")
-                        if self.tokens:
-                            self.tokens.pop(0)  # Consume "."
-                            self.parse_expression()
-                            self.syntax_tree.append(ASTNode(ASTNodeType.lambda_expr, "lambda", param_count + 1))
-                else:
-                    # print('Processing standard expression...')
-                    self.parse_where_expression()
+        current_token = self.peek()
+        if current_token.type == TokenType.KEYWORD and current_token.value in ["let", "fn"]:
+            # print('Processing keyword expression...')
+            if current_token.value == "let":
+                # print('Processing let expression...')
+                self.advance()  # Consume "let"
+                yield self.parse_definition()
+                if self.peek().value != "in":
+                    self.report("Syntax error in expression parsing: 'in' keyword expected")
+                self.advance()  # Consume "in"
+                yield self.parse_expression()
+                self.build_node(ASTNodeType.let, "let", 2)
             else:
-                print("Token format is invalid.")
+                self.advance()  # Consume "fn"
+                param_count = 0
+                while self.peek().type == TokenType.IDENTIFIER or self.peek().value == "(":
+                    self.parse_variable_binding()
+                    param_count += 1
+                if self.peek().value != ".":
+                    self.report("Syntax error in expression parsing: '.' expected")
+                self.advance()  # Consume "."
+                yield self.parse_expression()
+                self.build_node(ASTNodeType.lambda_expr, "lambda", param_count + 1)
         else:
-            print("No tokens available for parsing.")
+            # print('Processing standard expression...')
+            yield self.parse_where_expression()
 
     # Ew	->T 'where' Dr			=> 'where'
     # 		->T;
 
     def parse_where_expression(self):
-        self.parse_tuple_expression()
-        if self.tokens[0].value == "where":
-            self.tokens.pop(0)  # Consume "where"
-            self.parse_recursive_definition()
-            self.syntax_tree.append(ASTNode(ASTNodeType.where, "where", 2))
+        yield self.parse_tuple_expression()
+        if self.peek().value == "where":
+            self.advance()  # Consume "where"
+            yield self.parse_recursive_definition()
+            self.build_node(ASTNodeType.where, "where", 2)
 
     # Tuple Expression Parsing
 
@@ -157,14 +209,14 @@ class RPALParser:
     # 		-> Ta ;
             
     def parse_tuple_expression(self):
-        self.parse_tuple_augment()
+        yield self.parse_tuple_augment()
         element_count = 1
-        while self.tokens[0].value == ",":
-            self.tokens.pop(0)  # Consume comma
-            self.parse_tuple_augment()
+        while self.peek().value == ",":
+            self.advance()  # Consume comma
+            yield self.parse_tuple_augment()
             element_count += 1
         if element_count > 1:
-            self.syntax_tree.append(ASTNode(ASTNodeType.tau, "tau", element_count))
+            self.build_node(ASTNodeType.tau, "tau", element_count)
 
     '''
     # Ta 	-> Ta 'aug' Tc => 'aug'
@@ -173,27 +225,101 @@ class RPALParser:
     Ta -> Tc ('aug' Tc)*
     '''
     def parse_tuple_augment(self):
-        self.parse_tuple_conditional()
-        while self.tokens[0].value == "aug":
-            self.tokens.pop(0)  # Consume "aug"
-            self.parse_tuple_conditional()
-            self.syntax_tree.append(ASTNode(ASTNodeType.aug, "aug", 2))
+        yield self.parse_tuple_conditional()
+        while self.peek().value == "aug":
+            self.advance()  # Consume "aug"
+            yield self.parse_tuple_conditional()
+            self.build_node(ASTNodeType.aug, "aug", 2)
 
     '''
     Tc 	-> B '->' Tc '|' Tc => '->'
      		-> B ;
     '''    
     def parse_tuple_conditional(self):
-        self.parse_boolean_expression()
-        if self.tokens[0].value == "->":
-            self.tokens.pop(0)  # Consume '->'
-            self.parse_tuple_conditional()
-            if self.tokens[0].value != "|":
-                print("Syntax error in conditional: '|' separator expected")
+        if self.use_precedence_climbing:
+            yield self.parse_operator_expression()
+        else:
+            yield self.parse_boolean_expression()
+        if self.peek().value == "->":
+            self.advance()  # Consume '->'
+            yield self.parse_tuple_conditional()
+            if self.peek().value != "|":
+                self.report("Syntax error in conditional: '|' separator expected")
                 # return
-            self.tokens.pop(0)  # Consume '|'
-            self.parse_tuple_conditional()
-            self.syntax_tree.append(ASTNode(ASTNodeType.conditional, "->", 3))
+            self.advance()  # Consume '|'
+            yield self.parse_tuple_conditional()
+            self.build_node(ASTNodeType.conditional, "->", 3)
+
+    # Operator Expression Parsing (precedence climbing)
+    '''
+    Parses everything from B down to R in one loop. Each binary operator
+    has a precedence in BINARY_OPERATORS; the right operand is parsed with a
+    higher minimum precedence (the same one for the right associative '**'),
+    and application by juxtaposition binds tightest. 'upper' caps the
+    precedence of operators that may still follow once an operator has been
+    applied, mirroring which loop of the recursive descent chain would be
+    running at that point (e.g. comparisons are non-associative and 'not'
+    applies to a single Bp). Produces the same tree, and the same syntax
+    errors, as parse_boolean_expression.
+    '''
+    def parse_operator_expression(self, min_precedence=1):
+        upper = GAMMA_PRECEDENCE
+        token = self.peek()
+
+        # Prefix operators
+        if token.value == "not" and min_precedence <= NOT_PRECEDENCE:
+            self.advance()  # Consume 'not'
+            yield self.parse_operator_expression(COMPARE_PRECEDENCE)
+            self.build_node(ASTNodeType.op_not, "not", 1)
+            upper = NOT_PRECEDENCE - 1
+        elif token.value in ("+", "-") and min_precedence <= SIGN_PRECEDENCE:
+            self.advance()  # Consume unary sign
+            yield self.parse_operator_expression(SIGN_PRECEDENCE + 1)
+            if token.value == "-":
+                self.build_node(ASTNodeType.op_neg, "neg", 1)
+            upper = SIGN_PRECEDENCE
+        else:
+            yield self.parse_rand()
+
+        # Infix operators, including application
+        while True:
+            token = self.peek()
+            if token.type in RAND_TOKEN_TYPES or token.value in RAND_KEYWORDS:
+                if upper < GAMMA_PRECEDENCE:
+                    break
+                yield self.parse_rand()
+                self.build_node(ASTNodeType.gamma, "gamma", 2)
+                continue
+
+            operator = BINARY_OPERATORS.get(token.value)
+            if operator is None:
+                break
+            precedence, node_type, node_value = operator
+            if precedence < min_precedence or precedence > upper:
+                break
+            self.advance()  # Consume operator
+
+            if precedence == AT_PRECEDENCE:
+                if self.peek().type != TokenType.IDENTIFIER:
+                    self.report("Syntax error in power expression: IDENTIFIER required")
+                    upper = AT_PRECEDENCE - 1
+                    continue
+                self.build_node(ASTNodeType.identifier, self.advance().value, 0)
+                yield self.parse_operator_expression(GAMMA_PRECEDENCE)
+                self.build_node(node_type, node_value, 3)
+                upper = AT_PRECEDENCE
+                continue
+
+            if precedence == POWER_PRECEDENCE:
+                yield self.parse_operator_expression(precedence)
+            else:
+                yield self.parse_operator_expression(precedence + 1)
+            self.build_node(node_type, node_value, 2)
+            # Left associative operators may repeat, the others may not
+            if precedence == COMPARE_PRECEDENCE or precedence == POWER_PRECEDENCE:
+                upper = precedence - 1
+            else:
+                upper = precedence
 
     # Boolean Expression Parsing Methods
     '''
@@ -203,11 +329,11 @@ class RPALParser:
     B -> Bt ('or' Bt)*
     '''
     def parse_boolean_expression(self):
-        self.parse_boolean_term()
-        while self.tokens[0].value == "or":
-            self.tokens.pop(0)  # Consume 'or'
-            self.parse_boolean_term()
-            self.syntax_tree.append(ASTNode(ASTNodeType.op_or, "or", 2))
+        yield self.parse_boolean_term()
+        while self.peek().value == "or":
+            self.advance()  # Consume 'or'
+            yield self.parse_boolean_term()
+            self.build_node(ASTNodeType.op_or, "or", 2)
 
     '''
     # Bt	-> Bt '&' Bs => '&'
@@ -216,22 +342,22 @@ class RPALParser:
     Bt -> Bs ('&' Bs)*
     '''
     def parse_boolean_term(self):
-        self.parse_boolean_secondary()
-        while self.tokens[0].value == "&":
-            self.tokens.pop(0)  # Consume '&'
-            self.parse_boolean_secondary()
-            self.syntax_tree.append(ASTNode(ASTNodeType.op_and, "&", 2))
+        yield self.parse_boolean_secondary()
+        while self.peek().value == "&":
+            self.advance()  # Consume '&'
+            yield self.parse_boolean_secondary()
+            self.build_node(ASTNodeType.op_and, "&", 2)
 
     # Bs	-> 'not' Bp => 'not'
     # 		-> Bp ;
 
     def parse_boolean_secondary(self):
-        if self.tokens[0].value == "not":
-            self.tokens.pop(0)  # Consume 'not'
-            self.parse_boolean_primary()
-            self.syntax_tree.append(ASTNode(ASTNodeType.op_not, "not", 1))
+        if self.peek().value == "not":
+            self.advance()  # Consume 'not'
+            yield self.parse_boolean_primary()
+            self.build_node(ASTNodeType.op_not, "not", 1)
         else:
-            self.parse_boolean_primary()
+            yield self.parse_boolean_primary()
 
     #  Bp 	-> A ('gr' | '>' ) A => 'gr'
     # 			-> A ('ge' | '>=') A => 'ge'
@@ -243,21 +369,21 @@ class RPALParser:
             
 
     def parse_boolean_primary(self):
-        self.parse_arithmetic_expression()
-        current_token = self.tokens[0]
+        yield self.parse_arithmetic_expression()
+        current_token = self.peek()
         if current_token.value in [">", ">=", "<", "<=", "gr", "ge", "ls", "le", "eq", "ne"]:
-            self.tokens.pop(0)
-            self.parse_arithmetic_expression()
+            self.advance()
+            yield self.parse_arithmetic_expression()
             if current_token.value == ">":
-                self.syntax_tree.append(ASTNode(ASTNodeType.op_compare, "gr", 2))
+                self.build_node(ASTNodeType.op_compare, "gr", 2)
             elif current_token.value == ">=":
-                self.syntax_tree.append(ASTNode(ASTNodeType.op_compare, "ge", 2))
+                self.build_node(ASTNodeType.op_compare, "ge", 2)
             elif current_token.value == "<":
-                self.syntax_tree.append(ASTNode(ASTNodeType.op_compare, "ls", 2))
+                self.build_node(ASTNodeType.op_compare, "ls", 2)
             elif current_token.value == "<=":
-                self.syntax_tree.append(ASTNode(ASTNodeType.op_compare, "le", 2))
+                self.build_node(ASTNodeType.op_compare, "le", 2)
             else:
-                self.syntax_tree.append(ASTNode(ASTNodeType.op_compare, current_token.value, 2))
+                self.build_node(ASTNodeType.op_compare, current_token.value, 2)
 
     # Arithmetic Expression Parsing Methods
 
@@ -268,24 +394,24 @@ class RPALParser:
     # 		-> At ;
 
     def parse_arithmetic_expression(self):
-        if self.tokens[0].value == "+":
-            self.tokens.pop(0)  # Consume unary plus
-            self.parse_arithmetic_term()
-        elif self.tokens[0].value == "-":
-            self.tokens.pop(0)  # Consume unary minus
-            self.parse_arithmetic_term()
-            self.syntax_tree.append(ASTNode(ASTNodeType.op_neg, "neg", 1))
+        if self.peek().value == "+":
+            self.advance()  # Consume unary plus
+            yield self.parse_arithmetic_term()
+        elif self.peek().value == "-":
+            self.advance()  # Consume unary minus
+            yield self.parse_arithmetic_term()
+            self.build_node(ASTNodeType.op_neg, "neg", 1)
         else:
-            self.parse_arithmetic_term()
+            yield self.parse_arithmetic_term()
 
-        while self.tokens[0].value in {"+", "-"}:
-            operator_token = self.tokens[0]  # Store current operator
-            self.tokens.pop(0)  # Consume operator
-            self.parse_arithmetic_term()
+        while self.peek().value in {"+", "-"}:
+            operator_token = self.peek()  # Store current operator
+            self.advance()  # Consume operator
+            yield self.parse_arithmetic_term()
             if operator_token.value == "+":
-                self.syntax_tree.append(ASTNode(ASTNodeType.op_plus, "+", 2))
+                self.build_node(ASTNodeType.op_plus, "+", 2)
             else:
-                self.syntax_tree.append(ASTNode(ASTNodeType.op_minus, "-", 2))
+                self.build_node(ASTNodeType.op_minus, "-", 2)
 
     '''
     At 	-> At '*' Af => '*'
@@ -295,15 +421,15 @@ class RPALParser:
     At -> Af ('*' Af | '/' Af)*
     '''           
     def parse_arithmetic_term(self):
-        self.parse_arithmetic_factor()
-        while self.tokens[0].value in {"*", "/"}:
-            operator_token = self.tokens[0]  # Store current operator
-            self.tokens.pop(0)  # Consume operator
-            self.parse_arithmetic_factor()
+        yield self.parse_arithmetic_factor()
+        while self.peek().value in {"*", "/"}:
+            operator_token = self.peek()  # Store current operator
+            self.advance()  # Consume operator
+            yield self.parse_arithmetic_factor()
             if operator_token.value == "*":
-                self.syntax_tree.append(ASTNode(ASTNodeType.op_mul, "*", 2))
+                self.build_node(ASTNodeType.op_mul, "*", 2)
             else:
-                self.syntax_tree.append(ASTNode(ASTNodeType.op_div, "/", 2))
+                self.build_node(ASTNodeType.op_div, "/", 2)
 
     '''
     Af 	-> Ap '**' Af => '**'
@@ -313,11 +439,11 @@ class RPALParser:
     '''
 
     def parse_arithmetic_factor(self):
-        self.parse_arithmetic_power()
-        if self.tokens[0].value == "**":
-            self.tokens.pop(0)  # Consume power operator
-            self.parse_arithmetic_factor()
-            self.syntax_tree.append(ASTNode(ASTNodeType.op_pow, "**", 2))
+        yield self.parse_arithmetic_power()
+        if self.peek().value == "**":
+            self.advance()  # Consume power operator
+            yield self.parse_arithmetic_factor()
+            self.build_node(ASTNodeType.op_pow, "**", 2)
 
     '''
     Ap 	-> Ap '@' '<IDENTIFIER>' R => '@'
@@ -326,20 +452,20 @@ class RPALParser:
     Ap -> R ('@' '<IDENTIFIER>' R)*
     '''   
     def parse_arithmetic_power(self):
-        self.parse_rator_rand()
-        while self.tokens[0].value == "@":
-            self.tokens.pop(0)  # Consume @ operator
+        yield self.parse_rator_rand()
+        while self.peek().value == "@":
+            self.advance()  # Consume @ operator
             
-            if self.tokens[0].type != TokenType.IDENTIFIER:
-                print("Syntax error in power expression: IDENTIFIER required")
+            if self.peek().type != TokenType.IDENTIFIER:
+                self.report("Syntax error in power expression: IDENTIFIER required")
                 # Handle parsing error here
                 return
             
-            self.syntax_tree.append(ASTNode(ASTNodeType.identifier, self.tokens[0].value, 0))
-            self.tokens.pop(0)  # Consume IDENTIFIER
+            self.build_node(ASTNodeType.identifier, self.peek().value, 0)
+            self.advance()  # Consume IDENTIFIER
             
-            self.parse_rator_rand()
-            self.syntax_tree.append(ASTNode(ASTNodeType.at, "@", 3))
+            yield self.parse_rator_rand()
+            self.build_node(ASTNodeType.at, "@", 3)
 
     # Operator and Operand Parsing
     '''
@@ -350,13 +476,13 @@ class RPALParser:
     '''
             
     def parse_rator_rand(self):
-        self.parse_rand()
-        while (self.tokens[0].type in [TokenType.IDENTIFIER, TokenType.INTEGER, TokenType.STRING] or
-            self.tokens[0].value in ["true", "false", "nil", "dummy"] or
-            self.tokens[0].value == "("):
+        yield self.parse_rand()
+        while (self.peek().type in [TokenType.IDENTIFIER, TokenType.INTEGER, TokenType.STRING] or
+            self.peek().value in ["true", "false", "nil", "dummy"] or
+            self.peek().value == "("):
             
-            self.parse_rand()
-            self.syntax_tree.append(ASTNode(ASTNodeType.gamma, "gamma", 2))
+            yield self.parse_rand()
+            self.build_node(ASTNodeType.gamma, "gamma", 2)
 
     #        Rn 	-> '<IDENTIFIER>'
     # 				-> '<INTEGER>'
@@ -368,59 +494,59 @@ class RPALParser:
     # 				-> 'dummy' => 'dummy' ;
             
     def parse_rand(self):
-        token_type = self.tokens[0].type
-        token_value = self.tokens[0].value
+        token_type = self.peek().type
+        token_value = self.peek().value
 
         # print(f"Processing token: {token_type}, {token_value}")
         
         if token_type == TokenType.IDENTIFIER:
-            self.syntax_tree.append(ASTNode(ASTNodeType.identifier, token_value, 0))
+            self.build_node(ASTNodeType.identifier, token_value, 0)
             # print(token_value)
-            self.tokens.pop(0)
+            self.advance()
         elif token_type == TokenType.INTEGER:
-            self.syntax_tree.append(ASTNode(ASTNodeType.integer, token_value, 0))
+            self.build_node(ASTNodeType.integer, token_value, 0)
             # print(token_value)
-            self.tokens.pop(0)
+            self.advance()
         elif token_type == TokenType.STRING:
-            self.syntax_tree.append(ASTNode(ASTNodeType.string, token_value, 0))
+            self.build_node(ASTNodeType.string, token_value, 0)
             # print(token_value)
-            self.tokens.pop(0)
+            self.advance()
         elif token_type == TokenType.KEYWORD:
             if token_value == "true":
-                self.syntax_tree.append(ASTNode(ASTNodeType.true_value, token_value, 0))
+                self.build_node(ASTNodeType.true_value, token_value, 0)
                 # print(token_value)
-                self.tokens.pop(0)
+                self.advance()
             elif token_value == "false":
-                self.syntax_tree.append(ASTNode(ASTNodeType.false_value, token_value, 0))
+                self.build_node(ASTNodeType.false_value, token_value, 0)
                 # print(token_value)
-                self.tokens.pop(0)
+                self.advance()
             elif token_value == "nil":
-                self.syntax_tree.append(ASTNode(ASTNodeType.nil, token_value, 0))
+                self.build_node(ASTNodeType.nil, token_value, 0)
                 # print(token_value)
-                self.tokens.pop(0)
+                self.advance()
             elif token_value == "dummy":
-                self.syntax_tree.append(ASTNode(ASTNodeType.dummy, token_value, 0))
+                self.build_node(ASTNodeType.dummy, token_value, 0)
                 # print(token_value)
-                self.tokens.pop(0)
+                self.advance()
             else:
-                print("Syntax error in operand parsing: Unexpected KEYWORD")
+                self.report("Syntax error in operand parsing: Unexpected KEYWORD")
         elif token_type == TokenType.PUNCTUATION:
             if token_value == "(":
                 # # print(token_value)
-                self.tokens.pop(0)  # Consume '('
+                self.advance()  # Consume '('
                 
-                self.parse_expression()
+                yield self.parse_expression()
                 
-                if self.tokens[0].value != ")":
-                    print("Syntax error in operand parsing: Matching ')' expected")
+                if self.peek().value != ")":
+                    self.report("Syntax error in operand parsing: Matching ')' expected")
                     # return
                 # # print(tokens[0].value)
-                self.tokens.pop(0)  # Consume ')'
+                self.advance()  # Consume ')'
             else:
-                print("Syntax error in operand parsing: Unexpected PUNCTUATION")
+                self.report("Syntax error in operand parsing: Unexpected PUNCTUATION")
         else:
             print(token_type, token_value)
-            print("Syntax error in operand parsing: Expected operand but found something else")
+            self.report("Syntax error in operand parsing: Expected operand but found something else")
 
     # Definition Parsing Methods
 
@@ -428,92 +554,92 @@ class RPALParser:
     # 				-> Da ;
             
     def parse_definition(self):
-        self.parse_and_definition()
-        if self.tokens[0].value == "within":
+        yield self.parse_and_definition()
+        if self.peek().value == "within":
             # # print(tokens[0].value)
-            self.tokens.pop(0)  # Consume 'within'
-            self.parse_definition()
-            self.syntax_tree.append(ASTNode(ASTNodeType.within, "within", 2))
+            self.advance()  # Consume 'within'
+            yield self.parse_definition()
+            self.build_node(ASTNodeType.within, "within", 2)
 
     # Da  -> Dr ( 'and' Dr )+ => 'and'
     # 					-> Dr ;
             
     def parse_and_definition(self): 
-        self.parse_recursive_definition()
+        yield self.parse_recursive_definition()
         def_count = 1
-        while self.tokens[0].value == "and":
+        while self.peek().value == "and":
             # # print(tokens[0].value)
-            self.tokens.pop(0)
-            self.parse_recursive_definition()
+            self.advance()
+            yield self.parse_recursive_definition()
             def_count += 1
         if def_count > 1:
-            self.syntax_tree.append(ASTNode(ASTNodeType.and_op, "and", def_count))
+            self.build_node(ASTNodeType.and_op, "and", def_count)
 
     # Dr  -> 'rec' Db => 'rec'
     # 	-> Db ;
             
     def parse_recursive_definition(self):
         has_rec = False
-        if self.tokens[0].value == "rec":
+        if self.peek().value == "rec":
             # # print(tokens[0].value)
-            self.tokens.pop(0)
+            self.advance()
             has_rec = True
-        self.parse_basic_definition()
+        yield self.parse_basic_definition()
         if has_rec:
-            self.syntax_tree.append(ASTNode(ASTNodeType.rec, "rec", 1))
+            self.build_node(ASTNodeType.rec, "rec", 1)
 
     # Db  -> Vl '=' E => '='
     # 				-> '<IDENTIFIER>' Vb+ '=' E => 'fcn_form'
     # 				-> '(' D ')' ; 
             
     def parse_basic_definition(self): 
-        if self.tokens[0].type == TokenType.PUNCTUATION and self.tokens[0].value == "(":
-            # print(self.tokens[0].value)
-            self.tokens.pop(0)
-            self.parse_definition()
-            if self.tokens[0].value != ")":
-                print("Syntax error in basic definition #1")
+        if self.peek().type == TokenType.PUNCTUATION and self.peek().value == "(":
+            # print(self.peek().value)
+            self.advance()
+            yield self.parse_definition()
+            if self.peek().value != ")":
+                self.report("Syntax error in basic definition #1")
                 # return
             # print(tokens[0].value)
-            self.tokens.pop(0)
-        elif self.tokens[0].type == TokenType.IDENTIFIER:
-            # print(self.tokens[0].value)
-            if self.tokens[1].value == "(" or self.tokens[1].type == TokenType.IDENTIFIER:
+            self.advance()
+        elif self.peek().type == TokenType.IDENTIFIER:
+            # print(self.peek().value)
+            if self.peek(1).value == "(" or self.peek(1).type == TokenType.IDENTIFIER:
                 # Process function form
-                self.syntax_tree.append(ASTNode(ASTNodeType.identifier, self.tokens[0].value, 0))
-                # print(self.tokens[0].value)
-                self.tokens.pop(0)  # Consume ID
+                self.build_node(ASTNodeType.identifier, self.peek().value, 0)
+                # print(self.peek().value)
+                self.advance()  # Consume ID
 
                 child_count = 1  # Identifier child
-                while self.tokens[0].type == TokenType.IDENTIFIER or self.tokens[0].value == "(":
+                while self.peek().type == TokenType.IDENTIFIER or self.peek().value == "(":
                     self.parse_variable_binding()
                     child_count += 1
-                if self.tokens[0].value != "=":
-                    print("Syntax error in basic definition #2")
+                if self.peek().value != "=":
+                    self.report("Syntax error in basic definition #2")
                     # return
                 # print(tokens[0].value)
-                self.tokens.pop(0)
-                self.parse_expression()
+                self.advance()
+                yield self.parse_expression()
 
-                self.syntax_tree.append(ASTNode(ASTNodeType.fcn_form, "fcn_form", child_count+1))
-            elif self.tokens[1].value == "=":
-                self.syntax_tree.append(ASTNode(ASTNodeType.identifier, self.tokens[0].value, 0))
+                self.build_node(ASTNodeType.fcn_form, "function_form", child_count+1)
+            elif self.peek(1).value == "=":
+                self.build_node(ASTNodeType.identifier, self.peek().value, 0)
                 # print(tokens[0].value)
-                self.tokens.pop(0)  # Consume identifier
+                self.advance()  # Consume identifier
                 # print(tokens[0].value)
-                self.tokens.pop(0)  # Consume equal
-                self.parse_expression()
-                self.syntax_tree.append(ASTNode(ASTNodeType.equal, "=", 2))
-            elif self.tokens[1].value == ",":
+                self.advance()  # Consume equal
+                yield self.parse_expression()
+                self.build_node(ASTNodeType.equal, "=", 2)
+            elif self.peek(1).value == ",":
                 self.parse_variable_list()
-                if self.tokens[0].value != "=":
-                    print("Syntax error in basic definition")
+                if self.peek().value != "=":
+                    self.report("Syntax error in basic definition")
                     # return
                 # print(tokens[0].value)
-                self.tokens.pop(0)
-                self.parse_expression()
+                self.advance()
+                yield self.parse_expression()
 
-                self.syntax_tree.append(ASTNode(ASTNodeType.equal, "=", 2))
+                self.build_node(ASTNodeType.equal, "=", 2)
 
     # Variable Parsing Methods
                 
@@ -522,45 +648,45 @@ class RPALParser:
     # 	  -> '(' ')' => '()';
 
     def parse_variable_binding(self):
-        if self.tokens[0].type == TokenType.PUNCTUATION and self.tokens[0].value == "(":
-            # print(self.tokens[0].value)
-            self.tokens.pop(0)
+        if self.peek().type == TokenType.PUNCTUATION and self.peek().value == "(":
+            # print(self.peek().value)
+            self.advance()
             has_variable_list = False
 
-            if self.tokens[0].type == TokenType.IDENTIFIER:
-                # print(self.tokens[0].value)
+            if self.peek().type == TokenType.IDENTIFIER:
+                # print(self.peek().value)
                 self.parse_variable_list()
                 has_variable_list = True
             
-            if self.tokens[0].value != ")":
-                print("Syntax error: unmatched closing parenthesis")
+            if self.peek().value != ")":
+                self.report("Syntax error: unmatched closing parenthesis")
                 # return
-            # print(self.tokens[0].value)
-            self.tokens.pop(0)
+            # print(self.peek().value)
+            self.advance()
             if not has_variable_list:
-                self.syntax_tree.append(ASTNode(ASTNodeType.empty_params, "()", 0))
-        elif self.tokens[0].type == TokenType.IDENTIFIER:
-            self.syntax_tree.append(ASTNode(ASTNodeType.identifier, self.tokens[0].value, 0))
+                self.build_node(ASTNodeType.empty_params, "()", 0)
+        elif self.peek().type == TokenType.IDENTIFIER:
+            self.build_node(ASTNodeType.identifier, self.peek().value, 0)
             # print(tokens[0].value)
-            self.tokens.pop(0)
+            self.advance()
 
     # Vl -> '<IDENTIFIER>' list ',' => ','?;
             
     def parse_variable_list(self):
         var_count = 0
         while True:
-            # print(self.tokens[0].value)
+            # print(self.peek().value)
             if var_count > 0:
-                self.tokens.pop(0)
-            if not self.tokens[0].type == TokenType.IDENTIFIER:
-                print("Syntax error: identifier expected in variable list")
-            # print(self.tokens[0].value)
-            self.syntax_tree.append(ASTNode(ASTNodeType.identifier, self.tokens[0].value, 0))
+                self.advance()
+            if not self.peek().type == TokenType.IDENTIFIER:
+                self.report("Syntax error: identifier expected in variable list")
+            # print(self.peek().value)
+            self.build_node(ASTNodeType.identifier, self.peek().value, 0)
             
-            self.tokens.pop(0)
+            self.advance()
             var_count += 1
-            if not self.tokens[0].value == ",":
+            if not self.peek().value == ",":
                 break
         
         if var_count > 1:
-            self.syntax_tree.append(ASTNode(ASTNodeType.comma, ",", var_count))
\ No newline at end of file
+            self.build_node(ASTNodeType.comma, ",", var_count)
\ No newline at end of file
@@ -0,0 +1,104 @@
+import hashlib
+import os
+import pickle
+import sys
+import tempfile
+
+# Part of every cache key; bump it whenever the lexer, parser, standardizer
+# or control structure generator change what they produce for a program.
+INTERPRETER_VERSION = "1.3"
+
+DEFAULT_CACHE_DIR = os.path.join(os.path.expanduser("~"), ".cache", "rpal")
+DEFAULT_MAX_BYTES = 64 * 1024 * 1024
+CACHE_SUFFIX = ".cs"
+
+
+class ProgramCache:
+    """Content-addressed on-disk cache of generated control structures.
+
+    Entries are keyed by a hash of the program source and the interpreter
+    version, so an edited program or a new interpreter never sees a stale
+    entry. Reading an entry refreshes its modification time, and whenever
+    the directory grows beyond max_bytes the least recently used entries
+    are deleted.
+    """
+
+    def __init__(self, directory=None, max_bytes=DEFAULT_MAX_BYTES):
+        self.directory = directory or os.environ.get("RPAL_CACHE_DIR", DEFAULT_CACHE_DIR)
+        self.max_bytes = max_bytes
+
+    def key_for_file(self, file_name):
+        digest = hashlib.sha256(INTERPRETER_VERSION.encode() + b"\0")
+        with open(file_name, "rb") as source_file:
+            for chunk in iter(lambda: source_file.read(1 << 20), b""):
+                digest.update(chunk)
+        return digest.hexdigest()
+
+    def _path(self, key):
+        return os.path.join(self.directory, key + CACHE_SUFFIX)
+
+    def load(self, key):
+        """Return the cached control structures for key, or None on a miss"""
+        path = self._path(key)
+        try:
+            with open(path, "rb") as cache_file:
+                control_structures = pickle.load(cache_file)
+        except FileNotFoundError:
+            return None
+        except (OSError, pickle.UnpicklingError, EOFError, AttributeError, ImportError):
+            # Unreadable or written by an incompatible interpreter
+            self._remove(path)
+            return None
+        try:
+            os.utime(path)  # Mark as recently used
+        except OSError:
+            pass
+        return control_structures
+
+    def store(self, key, control_structures):
+        temp_path = None
+        try:
+            os.makedirs(self.directory, exist_ok=True)
+            # Write to a temporary file first so readers never see half an entry
+            handle, temp_path = tempfile.mkstemp(dir=self.directory, suffix=".tmp")
+            with os.fdopen(handle, "wb") as cache_file:
+                pickle.dump(control_structures, cache_file, protocol=pickle.HIGHEST_PROTOCOL)
+            os.replace(temp_path, self._path(key))
+            temp_path = None
+        except (OSError, pickle.PicklingError) as e:
+            # The cache is only an optimization: warn without touching the
+            # program's own output and run the program anyway
+            print(f"Warning: could not write program cache: {e}", file=sys.stderr)
+            return
+        finally:
+            # evict() never sees temporary files, so none may be left behind
+            if temp_path is not None:
+                self._remove(temp_path)
+        self.evict()
+
+    def evict(self):
+        """Delete least recently used entries until the cache fits in max_bytes"""
+        entries = []
+        total = 0
+        with os.scandir(self.directory) as scan:
+            for entry in scan:
+                if entry.name.endswith(CACHE_SUFFIX):
+                    try:
+                        stat = entry.stat()
+                    except FileNotFoundError:
+                        # Evicted by another interpreter since the scan listed it
+                        continue
+                    entries.append((stat.st_mtime, stat.st_size, entry.path))
+                    total += stat.st_size
+        entries.sort()
+        for _, size, path in entries:
+            if total <= self.max_bytes:
+                break
+            self._remove(path)
+            total -= size
+
+    def _remove(self, path):
+        try:
+            os.remove(path)
+        except OSError:
+            pass
@@ -1,4 +1,6 @@
 class TreeNode:
+    __slots__ = ("value", "children")
+
     def __init__(self, value):
         self.value = value
         self.children = []
@@ -10,10 +12,22 @@ class TreeNode:
         return f"TreeNode({self.value!r})"
 
 
-def standardize_tree(node):
-    for i in range(len(node.children)):
-        node.children[i] = standardize_tree(node.children[i])
-    
+def standardize_tree(root):
+    # Post-order walk on an explicit stack: a node is standardized only after
+    # all of its descendants, without recursing on the tree depth
+    stack = [(root, False)]
+    while stack:
+        node, children_done = stack.pop()
+        if children_done:
+            standardize_node(node)
+        else:
+            stack.append((node, True))
+            for child in node.children:
+                stack.append((child, False))
+    return root
+
+
+def standardize_node(node):
     if node.value == "let":
         node.value = "gamma"
         P = node.children[1]
@@ -121,96 +135,10 @@ def standardize_tree(node):
     return node
 
 
-def build_tree(input_str):
-    lines = [line.strip() for line in input_str.strip().split('\n') if line.strip()]
-    root = TreeNode("ROOT")
-    stack = [(root, -1)]
-
-    for line in lines:
-        depth = len(line) - len(line.lstrip('.'))
-        token = line.lstrip('.').split()[0]
-        node = TreeNode(token)
-
-        while stack and stack[-1][1] >= depth:
-            stack.pop()
-
-        parent_node, _ = stack[-1]
-        parent_node.add_child(node)
-        stack.append((node, depth))
-
-    return root
-
-
 def print_tree(node, indent=0):
-    print("." * indent + node.value)
-    for child in node.children:
-        print_tree(child, indent + 1)
-
-# # Sample Input
-# input_text = """
-# let
-# .rec
-# ..function_form
-# ...f
-# ...n
-# ...->
-# ....eq
-# .....n
-# .....1
-# ....0
-# ....->
-# .....eq
-# ......n
-# ......2
-# .....1
-# .....+
-# ......gamma
-# .......f
-# .......-
-# ........n
-# ........1
-# ......gamma
-# .......f
-# .......-
-# ........n
-# ........2
-# .let
-# ..rec
-# ...function_form
-# ....fib
-# ....n
-# ....->
-# .....eq
-# ......n
-# ......0
-# .....nil
-# .....aug
-# ......gamma
-# .......fib
-# ......-
-# .......n
-# .......1
-# ......gamma
-# .......f
-# .......n
-# ..gammma
-# ...print
-# ...gamma
-# ....fib
-# ....5
-
-
-
-# """
-
-# # Build and standardize tree
-# tree_root = build_tree(input_text)
-# standardized_root = standardize_tree(tree_root.children[0])
-
-# Generate control structures
-# generator = ControlStructureGenerator()
-# control_structures = generator.generate(standardized_root)
-
-# # Print control structures
-# for name, items in control_structures.items():
-#     print(f"{name} = {' '.join(items)}")
+    stack = [(node, indent)]
+    while stack:
+        node, indent = stack.pop()
+        print("." * indent + node.value)
+        for child in reversed(node.children):
+            stack.append((child, indent + 1))
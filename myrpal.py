@@ -1,72 +1,139 @@
 import argparse
-import tokenize
-from Lexical_Analyzer.lexical_analyzer import tokenize, show_tokens
-from Parser.parser import RPALParser
-from Standardizer.standardizer import build_tree, standardize_tree, print_tree
-from CSE_Machine.control_structures import ControlStructureGenerator
-from CSE_Machine.cseMachine import CSEMachine
+from CSE_Machine.cseMachine import CSEMachine, TRACE_LEVELS
+from CSE_Machine.program_artifact import is_artifact, write_artifact
+from CSE_Machine.instructions import disassemble
+from Program_Cache.program_cache import ProgramCache
 
-def main():
-    parser = argparse.ArgumentParser(description='Run RPAL programs.')
-    parser.add_argument('file_name', type=str, help='Path to the RPAL source file')
-    parser.add_argument('-tokens', action='store_true', help='Show tokens')
-    parser.add_argument('-ast', action='store_true', help='Show abstract syntax tree')
-    parser.add_argument('-sast', action='store_true', help='Show standardized abstract syntax tree')
-    parser.add_argument('-cs', action='store_true', help='Show control structures')
-
-    args = parser.parse_args()
+def build_standardized_tree(args):
+    # Returns the standardized tree (None when there is nothing to run) and
+    # whether the lexer or the parser reported an error on the way.
+    # The front end is only imported when a program has to be compiled, so
+    # running a compiled program or a cached one does not pay for it
+    from Lexical_Analyzer.lexical_analyzer import stream_tokens, show_tokens
+    from Parser.parser import RPALParser
+    from Standardizer.standardizer import standardize_tree, print_tree
 
-    input_file = open(args.file_name, "r")
-    input_text = input_file.read()
-    input_file.close()
-
-    # Lexical Analyzer
-    tokens = tokenize(input_text)
+    # Lexical Analyzer (tokens are produced lazily as the parser asks for them)
+    tokens = stream_tokens(args.file_name)
     
     if args.tokens:
         show_tokens(tokens)
-        return
+        return None, tokens.errors
     
     # Abstract Syntax Tree (AST)
     parser = RPALParser(tokens)
-    ast_nodes = parser.build_ast()
-    if ast_nodes is None:
-        return
-
-    string_ast_list = parser.generate_string_representation()
-    string_ast = ""
-    for string in string_ast_list:
-        string_ast += string + "\n"
+    ast_root = parser.build_ast()
+    reported_errors = tokens.errors or parser.errors
+    if ast_root is None:
+        return None, reported_errors
 
     if args.ast:
-        print(string_ast)
-        return
+        for string in parser.generate_string_representation():
+            print(string)
+        print()
+        return None, reported_errors
 
-    # Standard Abstract Syntax Tree (SAST)
-    tree_root = build_tree(string_ast)
-    standardized_root = standardize_tree(tree_root.children[0])
+    # Standard Abstract Syntax Tree (SAST), built from the AST in place
+    standardized_root = standardize_tree(ast_root)
 
     if args.sast:
         print_tree(standardized_root)
-        return
+        return None, reported_errors
+    
+    return standardized_root, reported_errors
+
+def build_control_structures(args):
+    from CSE_Machine.control_structures import ControlStructureGenerator
+
+    standardized_root, reported_errors = build_standardized_tree(args)
+    if standardized_root is None:
+        return None, reported_errors
     
     # Generate control structures
     generator = ControlStructureGenerator()
-    control_structures = generator.generate(standardized_root)
+    return generator.generate(standardized_root), reported_errors
+
+def run_closure_engine(args):
+    from Closure_Engine.closure_engine import ClosureEngine
+
+    # The engine compiles the standardized tree itself, so neither a
+    # compiled program nor the cache (both hold control structures) helps
+    if is_artifact(args.file_name):
+        print("Error: a compiled program holds no syntax tree; run it with -engine cse")
+        return
+    if args.trace != 'off':
+        print("Error: -trace needs -engine cse")
+        return
+    
+    standardized_root, _ = build_standardized_tree(args)
+    if standardized_root is None:
+        return
+    ClosureEngine(standardized_root).run()
+
+def main():
+    parser = argparse.ArgumentParser(description='Run RPAL programs.')
+    parser.add_argument('file_name', type=str, help='Path to the RPAL source file')
+    parser.add_argument('-tokens', action='store_true', help='Show tokens')
+    parser.add_argument('-ast', action='store_true', help='Show abstract syntax tree')
+    parser.add_argument('-sast', action='store_true', help='Show standardized abstract syntax tree')
+    parser.add_argument('-cs', action='store_true', help='Show control structures')
+    parser.add_argument('--no-cache', action='store_true', help='Do not read or write the program cache')
+    parser.add_argument('-compile', metavar='OUTPUT', help='Only compile the program into a binary artifact')
+    parser.add_argument('-trace', choices=TRACE_LEVELS, default='off',
+                        help='Trace execution: each instruction, or the full machine state')
+    parser.add_argument('-engine', choices=['cse', 'closure'], default='cse',
+                        help='Run on the CSE machine, or compile the standardized tree to Python closures')
+
+    args = parser.parse_args()
+    trace = TRACE_LEVELS[args.trace]
+
+    # -cs and -compile are about control structures, whichever engine is chosen
+    if args.engine == 'closure' and not (args.cs or args.compile):
+        run_closure_engine(args)
+        return
+
+    # A compiled program already holds the control structures
+    if is_artifact(args.file_name):
+        if args.tokens or args.ast or args.sast:
+            print("Error: tokens and syntax trees are not stored in a compiled program")
+            return
+        machine = CSEMachine.from_artifact(args.file_name, trace)
+        control_structures = machine.deltas
+    else:
+        machine = None
+        control_structures = None
+
+    # Reuse the control structures of an earlier run of the same program
+    cache = None
+    if control_structures is None and not (args.tokens or args.ast or args.sast or args.no_cache):
+        cache = ProgramCache()
+        cache_key = cache.key_for_file(args.file_name)
+        control_structures = cache.load(cache_key)
+
+    if control_structures is None:
+        control_structures, reported_errors = build_control_structures(args)
+        if control_structures is None:
+            return
+        # A cache hit skips the front end, so a program it complained about
+        # is not cached: every run has to show the diagnostics again
+        if cache is not None and not reported_errors:
+            cache.store(cache_key, control_structures)
+
+    if args.compile:
+        write_artifact(args.compile, control_structures)
+        return
 
     if args.cs:
         for name, items in control_structures.items():
-            print(f"{name} = {' '.join(items)}")
+            print(f"{name} = {' '.join(disassemble(item) for item in items)}")
         return
     
-    machine = CSEMachine(control_structures)
-    
-    # Initial state: Stack has e0, Control has e0, delta0
-    machine.stack = ["e0"]
-    machine.control = ["e0", "delta0"]
+    if machine is None:
+        machine = CSEMachine(control_structures, trace)
     
     result = machine.run()
-    print(f"\nFinal result: {result}")
+    if trace:
+        print(f"\nFinal result: {result}")
 
 if __name__ == "__main__":
     main()
@@ -0,0 +1,38 @@
+from CSE_Machine.cseMachine import CSEMachine
+from CSE_Machine.instructions import Instruction, TAU, LITERAL
+from CSE_Machine.values import NIL
+
+
+def test_tau_without_operands_makes_nil():
+    # A hand-built or malformed program can ask for more elements than
+    # the stack holds; tau takes what there is
+    assert CSEMachine({"delta0": [Instruction(TAU, 2)]}).run() is NIL
+
+
+def test_tau_with_too_few_operands_takes_what_there_is():
+    result = CSEMachine({"delta0": [Instruction(TAU, 3), Instruction(LITERAL, 1)]}).run()
+    assert list(result) == [1]
+
+
+def compile_source(source):
+    from Lexical_Analyzer.lexical_analyzer import tokenize
+    from Parser.parser import RPALParser
+    from Standardizer.standardizer import standardize_tree
+    from CSE_Machine.control_structures import ControlStructureGenerator
+    return ControlStructureGenerator().generate(standardize_tree(RPALParser(tokenize(source)).build_ast()))
+
+
+def test_environments_are_only_counted_when_asked():
+    machine = CSEMachine(compile_source("let f x = x + 1 in f 2"))
+    assert machine.run() == 3
+    assert machine.live_environments is None
+    assert machine.peak_environments is None
+
+
+def test_traced_run_reports_the_environments_still_live(capsys):
+    from CSE_Machine.cseMachine import TRACE_INSTRUCTIONS
+    machine = CSEMachine(compile_source("let f x = x + 1 in f 2"), TRACE_INSTRUCTIONS)
+    assert machine.run() == 3
+    report = capsys.readouterr().out.splitlines()[-1]
+    assert report == f"Environments: {machine.live_environments} live, {machine.peak_environments} peak"
+    assert machine.live_environments == 1
@@ -0,0 +1,15 @@
+from Lexical_Analyzer.lexical_analyzer import generate_tokens, stream_tokens
+
+SOURCE = "let x = 3 // three\nand s = 'two\nlines'\nin\nPrint (x, s)\n"
+
+
+def token_list(tokens):
+    return [(token.get_type(), token.get_value()) for token in tokens]
+
+
+def test_crlf_source_file_scans_like_lf(tmp_path, capsys):
+    source_file = tmp_path / "crlf.rpal"
+    source_file.write_bytes(SOURCE.replace("\n", "\r\n").encode())
+
+    assert token_list(stream_tokens(str(source_file))) == token_list(generate_tokens(SOURCE))
+    assert capsys.readouterr().out == ""
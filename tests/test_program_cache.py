@@ -0,0 +1,33 @@
+import os
+import subprocess
+import sys
+
+MYRPAL = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "myrpal.py")
+
+
+def run_program(file_name, cache_dir):
+    environment = dict(os.environ, RPAL_CACHE_DIR=str(cache_dir))
+    completed = subprocess.run([sys.executable, MYRPAL, str(file_name)], env=environment,
+                               capture_output=True, text=True, check=True)
+    return completed.stdout
+
+
+def test_program_with_syntax_errors_reports_them_on_every_run(tmp_path):
+    source_file = tmp_path / "program.rpal"
+    source_file.write_text("let f x = x + 1 in Print (f 2 3 @ )")
+    cache_dir = tmp_path / "cache"
+
+    first = run_program(source_file, cache_dir)
+    second = run_program(source_file, cache_dir)
+    assert "Syntax error" in first
+    assert second == first
+
+
+def test_program_without_errors_is_cached(tmp_path):
+    source_file = tmp_path / "program.rpal"
+    source_file.write_text("Print (1 + 2)")
+    cache_dir = tmp_path / "cache"
+
+    assert run_program(source_file, cache_dir) == "3\n"
+    assert os.listdir(cache_dir)
+    assert run_program(source_file, cache_dir) == "3\n"